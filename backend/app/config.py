@@ -0,0 +1,92 @@
+import os
+
+# --------------------------------------------------
+# Runtime settings (override with environment variables)
+# --------------------------------------------------
+
+# Number of solved (problem_type, expression) pairs kept in memory, and the
+# total graph values (coordinates) they may hold; responses are evicted
+# oldest first past either limit (0 = no value limit)
+SOLVER_CACHE_SIZE = int(os.getenv("SOLVER_CACHE_SIZE", "512"))
+SOLVER_CACHE_MAX_VALUES = int(os.getenv("SOLVER_CACHE_MAX_VALUES", "1000000"))
+
+# Seconds a single solve may run before the request gives up on it
+SOLVER_TIMEOUT_SECONDS = float(os.getenv("SOLVER_TIMEOUT_SECONDS", "10"))
+
+# Concurrent solver jobs. In process mode each worker is a separate Python
+# process of roughly 100 MB, so this sets most of the server's footprint
+SOLVER_WORKERS = int(os.getenv("SOLVER_WORKERS", "2"))
+
+# Expensive problems (see COMPLEXITY_HEAVY_COST) run in a separate, smaller
+# lane with a longer timeout so they can't starve quick ones. Its workers
+# start with the first heavy problem rather than at boot
+SOLVER_HEAVY_WORKERS = int(os.getenv("SOLVER_HEAVY_WORKERS", str(max(1, SOLVER_WORKERS // 2))))
+SOLVER_HEAVY_TIMEOUT_SECONDS = float(os.getenv("SOLVER_HEAVY_TIMEOUT_SECONDS", "30"))
+
+# Estimated cost (app.solver.complexity) at which a problem goes to the heavy
+# lane, and above which it is rejected outright; see "values" in /metrics
+COMPLEXITY_HEAVY_COST = float(os.getenv("COMPLEXITY_HEAVY_COST", "120"))
+COMPLEXITY_MAX_COST = float(os.getenv("COMPLEXITY_MAX_COST", "2000"))
+
+# Longer inputs are rejected before parsing (0 = no limit)
+MAX_EXPRESSION_LENGTH = int(os.getenv("MAX_EXPRESSION_LENGTH", "1000"))
+
+# Memory governance (see app/solver/memory.py). Each process running solver
+# jobs clears SymPy's cache and our parse/compile caches every N jobs and
+# whenever its RSS exceeds the soft limit (0 disables either trigger).
+# Process workers are recycled after WORKER_MAX_JOBS jobs or once their RSS
+# stays above WORKER_MAX_RSS_MB after a clear. SymPy's own cache size is set
+# with its SYMPY_CACHE_SIZE environment variable.
+MEMORY_CLEAR_CACHE_JOBS = int(os.getenv("MEMORY_CLEAR_CACHE_JOBS", "200"))
+MEMORY_CLEAR_CACHE_RSS_MB = float(os.getenv("MEMORY_CLEAR_CACHE_RSS_MB", "400"))
+WORKER_MAX_JOBS = int(os.getenv("WORKER_MAX_JOBS", "2000"))
+WORKER_MAX_RSS_MB = float(os.getenv("WORKER_MAX_RSS_MB", "600"))
+
+# Where solver jobs run: "process" (killable on disconnect/timeout), "thread",
+# or "async" (inline on the event loop; a load-test baseline)
+SOLVER_EXECUTION = os.getenv("SOLVER_EXECUTION", "process")
+
+# Decimal places kept for graph coordinates in responses
+GRAPH_PRECISION = int(os.getenv("GRAPH_PRECISION", "4"))
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "500"))
+
+# gzip level (1-9) and brotli quality (0-11); mid values favour speed
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+# Points sampled per graph series (also the default response resolution)
+GRAPH_POINTS = int(os.getenv("GRAPH_POINTS", "400"))
+
+# Upper bound on points per graph series
+GRAPH_MAX_POINTS = int(os.getenv("GRAPH_MAX_POINTS", "2000"))
+
+# Requested graph windows must stay within [-GRAPH_MAX_ABS_X, GRAPH_MAX_ABS_X]
+GRAPH_MAX_ABS_X = float(os.getenv("GRAPH_MAX_ABS_X", "1000000"))
+
+# Sampled points each live session keeps per series for pan/zoom reuse
+GRAPH_CACHE_POINTS = int(os.getenv("GRAPH_CACHE_POINTS", "20000"))
+
+# Quiet period after a keystroke before a live session re-solves
+SESSION_DEBOUNCE_SECONDS = float(os.getenv("SESSION_DEBOUNCE_SECONDS", "0.25"))
+
+# Precomputed answer index built by `python -m app.precomputed.build_index`
+PRECOMPUTED_INDEX_PATH = os.getenv(
+    "PRECOMPUTED_INDEX_PATH",
+    os.path.join(os.path.dirname(__file__), "precomputed", "answers.idx")
+)
+
+# Sample points for numerically checking derivative and integral answers
+# (the response's "verified" flag); 0 turns verification off
+VERIFY_POINTS = int(os.getenv("VERIFY_POINTS", "64"))
+
+# Implicit curves: grid points per axis (default and cap) and the memory
+# budget for evaluating one chunk of grid rows
+IMPLICIT_GRID_POINTS = int(os.getenv("IMPLICIT_GRID_POINTS", "121"))
+IMPLICIT_MAX_GRID_POINTS = int(os.getenv("IMPLICIT_MAX_GRID_POINTS", "600"))
+IMPLICIT_GRID_BUDGET_BYTES = int(os.getenv("IMPLICIT_GRID_BUDGET_BYTES", str(16 * 1024 * 1024)))
+
+# Points per axis of the dy/dx slope field sent with implicit curves; fixed,
+# so the response doesn't grow with the requested curve resolution
+IMPLICIT_SLOPE_POINTS = int(os.getenv("IMPLICIT_SLOPE_POINTS", "21"))
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+
+# --------------------------------------------------
+# Per-process CPU and RSS from /proc (Linux only)
+#
+# Elsewhere the sampler reports nothing rather than guessing.
+# --------------------------------------------------
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def supported() -> bool:
+    return os.path.isdir("/proc/self")
+
+
+def _stat(pid: int):
+    """
+    Returns (parent pid, cpu seconds, rss bytes) or None if the process is gone.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            data = f.read().decode("utf-8", "replace")
+    except OSError:
+        return None
+    # The command name may contain spaces; fields resume after its ")"
+    fields = data[data.rindex(")") + 2:].split()
+    ppid = int(fields[1])
+    cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    rss = int(fields[21]) * PAGE_SIZE
+    return ppid, cpu, rss
+
+
+def _is_helper(pid: int) -> bool:
+    # multiprocessing's resource tracker is a child too, but does no solving
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return b"resource_tracker" in f.read()
+    except OSError:
+        return True
+
+
+def _children(pid: int) -> list:
+    children = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            stat = _stat(int(entry))
+            if stat is not None and stat[0] == pid and not _is_helper(int(entry)):
+                children.append(int(entry))
+    return children
+
+
+class ResourceSampler:
+    """
+    Polls a process and its direct children (solver workers) in the
+    background. Workers that are killed and replaced during the run each
+    keep their own entry.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self._seen = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _poll(self):
+        now = time.perf_counter()
+        for role, pid in [("server", self.pid)] + [("worker", p) for p in _children(self.pid)]:
+            stat = _stat(pid)
+            if stat is None:
+                continue
+            _, cpu, rss = stat
+            entry = self._seen.get(pid)
+            if entry is None:
+                entry = self._seen[pid] = {
+                    "role": role, "pid": pid, "first": now, "last": now,
+                    "cpu_start": cpu, "cpu": cpu, "rss_peak": rss
+                }
+            entry["last"] = now
+            entry["cpu"] = cpu
+            entry["rss_peak"] = max(entry["rss_peak"], rss)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._poll()
+
+    def start(self):
+        if supported():
+            self._poll()
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> list:
+        """
+        Stops sampling and returns one summary per process seen:
+        {"role", "pid", "cpu_seconds", "cpu_percent", "rss_peak_mb"}.
+        """
+        if self._thread is None:
+            return []
+        self._stop.set()
+        self._thread.join()
+        self._poll()
+
+        summaries = []
+        for entry in self._seen.values():
+            cpu_seconds = entry["cpu"] - entry["cpu_start"]
+            wall = entry["last"] - entry["first"]
+            summaries.append({
+                "role": entry["role"],
+                "pid": entry["pid"],
+                "cpu_seconds": round(cpu_seconds, 2),
+                "cpu_percent": round(100 * cpu_seconds / wall, 1) if wall > 0 else None,
+                "rss_peak_mb": round(entry["rss_peak"] / 2 ** 20, 1)
+            })
+        return summaries
@@ -0,0 +1,344 @@
+"""
+Load generator for POST /solve.
+
+Replays a synthetic (or recorded) mix of algebra, derivative, integral and
+limit problems against the app, once per execution mode, and prints the
+results side by side. Nothing external is needed: the app runs either
+in-process behind an ASGI transport or as a local uvicorn server.
+
+Run from backend/:
+    python -m app.loadtest.run                                  # 500 requests, 8 concurrent
+    python -m app.loadtest.run --rate 20 --duration 30          # open loop at 20 req/s
+    python -m app.loadtest.run --transport uvicorn --modes process,thread
+    python -m app.loadtest.run --replay traffic.txt --cold --json results.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from app import config
+from app.loadtest.resources import ResourceSampler
+from app.loadtest.workload import DEFAULT_MIX, load_replay, parse_mix, synthetic_workload
+from app.solver.executors import EXECUTORS
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Upper edges (ms) of the latency histogram buckets
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+
+class Results:
+    def __init__(self):
+        self.latencies = []
+        self.ok = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, seconds: float, outcome: str):
+        self.latencies.append(seconds)
+        setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def percentile(self, q: float):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def histogram(self) -> list:
+        counts = [0] * len(BUCKETS_MS)
+        for seconds in self.latencies:
+            ms = seconds * 1000
+            counts[next(i for i, edge in enumerate(BUCKETS_MS) if ms <= edge)] += 1
+        return counts
+
+    def summary(self) -> dict:
+        total = len(self.latencies)
+        wall = (self.finished or time.perf_counter()) - self.started
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "requests": total,
+            "wall_seconds": round(wall, 2),
+            "throughput_rps": round(total / wall, 2) if wall > 0 else None,
+            "latency_ms": {
+                "p50": ms(self.percentile(0.50)),
+                "p90": ms(self.percentile(0.90)),
+                "p99": ms(self.percentile(0.99)),
+                "max": ms(max(self.latencies, default=None)),
+            },
+            "error_rate": round(self.errors / total, 4) if total else None,
+            "timeout_rate": round(self.timeouts / total, 4) if total else None,
+            "rejected_rate": round(self.rejected / total, 4) if total else None,
+            "histogram": dict(zip([f"<={edge:g}ms" for edge in BUCKETS_MS], self.histogram())),
+        }
+
+
+async def send(client: httpx.AsyncClient, body: dict, results: Results):
+    start = time.perf_counter()
+    try:
+        response = await client.post("/solve", json=body)
+        if response.status_code == 504:
+            outcome = "timeouts"
+        elif response.status_code == 200:
+            outcome = "ok"
+        elif response.status_code == 422:
+            outcome = "rejected"
+        else:
+            outcome = "errors"
+    except httpx.TimeoutException:
+        outcome = "timeouts"
+    except httpx.HTTPError:
+        outcome = "errors"
+    results.record(time.perf_counter() - start, outcome)
+
+
+async def closed_loop(client, bodies, results: Results, concurrency: int, deadline=None):
+    """
+    `concurrency` clients, each sending its next request as soon as the last returns.
+    """
+    queue = iter(bodies)
+
+    async def client_loop():
+        for body in queue:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            await send(client, body, results)
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+
+async def open_loop(client, bodies, results: Results, rate: float, deadline=None):
+    """
+    Starts requests on a fixed schedule of `rate` per second regardless of
+    how many are still in flight, so overload shows up as growing latency.
+    """
+    start = time.perf_counter()
+    in_flight = set()
+    for i, body in enumerate(bodies):
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        task = asyncio.create_task(send(client, body, results))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    await asyncio.gather(*in_flight)
+
+
+def counter_delta(before: dict, after: dict) -> dict:
+    delta = {
+        name: value - before.get("counters", {}).get(name, 0)
+        for name, value in after.get("counters", {}).items()
+    }
+    return {name: value for name, value in delta.items() if value}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_uvicorn(mode: str, cold: bool):
+    port = free_port()
+    env = dict(os.environ, SOLVER_EXECUTION=mode)
+    if cold:
+        env.update(SOLVER_CACHE_SIZE="0", PRECOMPUTED_INDEX_PATH="")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            httpx.get(base_url + "/", timeout=1)
+            return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("uvicorn did not start within 30 seconds")
+
+
+def configure_in_process(mode: str, cold: bool):
+    """
+    Points the in-process registry at `mode`, starting from an empty cache.
+    """
+    from app.precomputed.index import index
+    from app.solver.registry import registry
+
+    registry.shutdown()
+    registry.execution = mode
+    registry.cache.clear()
+    if cold:
+        registry.cache.maxsize = 0
+        index.close()
+    registry.start()
+    # The server starts the heavy lane on demand; warm it here so its
+    # startup isn't measured as solve time
+    registry.executor("heavy").wait_ready()
+    return registry
+
+
+async def run_mode(mode: str, bodies: list, args) -> dict:
+    timeout = httpx.Timeout(max(config.SOLVER_TIMEOUT_SECONDS, config.SOLVER_HEAVY_TIMEOUT_SECONDS) + 10)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    server = None
+
+    if args.transport == "uvicorn":
+        server, base_url = start_uvicorn(mode, args.cold)
+        client = httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits)
+        pid = server.pid
+    else:
+        from app.main import app
+
+        registry = configure_in_process(mode, args.cold)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=timeout
+        )
+        pid = os.getpid()
+
+    try:
+        # Warm-up requests load SymPy in every worker; they are not measured
+        warmup = Results()
+        await closed_loop(client, bodies[:args.warmup], warmup, max(1, args.concurrency or 1))
+
+        before = (await client.get("/metrics")).json()
+        workload = itertools.cycle(bodies) if args.duration else bodies
+        deadline = time.perf_counter() + args.duration if args.duration else None
+
+        sampler = ResourceSampler(pid).start()
+        results = Results()
+        if args.rate:
+            await open_loop(client, workload, results, args.rate, deadline)
+        else:
+            await closed_loop(client, workload, results, args.concurrency, deadline)
+        results.finished = time.perf_counter()
+        processes = sampler.stop()
+
+        after = (await client.get("/metrics")).json()
+    finally:
+        await client.aclose()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        else:
+            registry.shutdown()
+
+    summary = results.summary()
+    summary["mode"] = mode
+    summary["processes"] = processes
+    summary["server_counters"] = counter_delta(before, after)
+    return summary
+
+
+def print_histogram(summary: dict):
+    counts = summary["histogram"]
+    peak = max(counts.values()) or 1
+    print(f"\n[{summary['mode']}] latency histogram")
+    for label, count in counts.items():
+        if count:
+            print(f"  {label:>10} {count:6d} {'#' * max(1, round(40 * count / peak))}")
+
+
+def print_table(summaries: list):
+    def row(label, values):
+        print(f"{label:<24}" + "".join(f"{str(v if v is not None else '-'):>14}" for v in values))
+
+    def processes(summary, role):
+        return [p for p in summary["processes"] if p["role"] == role]
+
+    def total_cpu(summary, role):
+        found = processes(summary, role)
+        return round(sum(p["cpu_percent"] or 0 for p in found), 1) if found else None
+
+    def peak_rss(summary, role):
+        found = processes(summary, role)
+        return max(p["rss_peak_mb"] for p in found) if found else None
+
+    print()
+    row("", [s["mode"] for s in summaries])
+    row("requests", [s["requests"] for s in summaries])
+    row("throughput (req/s)", [s["throughput_rps"] for s in summaries])
+    for q in ("p50", "p90", "p99", "max"):
+        row(f"latency {q} (ms)", [s["latency_ms"][q] for s in summaries])
+    row("error rate", [s["error_rate"] for s in summaries])
+    row("timeout rate", [s["timeout_rate"] for s in summaries])
+    row("rejected rate", [s["rejected_rate"] for s in summaries])
+    row("server cpu %", [total_cpu(s, "server") for s in summaries])
+    row("server rss peak (MB)", [peak_rss(s, "server") for s in summaries])
+    row("worker processes", [len(processes(s, "worker")) or None for s in summaries])
+    row("workers cpu % (sum)", [total_cpu(s, "worker") for s in summaries])
+    row("worker rss peak (MB)", [peak_rss(s, "worker") for s in summaries])
+
+
+async def main(args):
+    if args.replay:
+        bodies = load_replay(args.replay)
+    else:
+        bodies = synthetic_workload(args.requests, parse_mix(args.mix), args.seed)
+    if not bodies:
+        raise SystemExit("No requests to send")
+
+    load = f"{args.rate:g} req/s" if args.rate else f"concurrency {args.concurrency}"
+    extent = f"{args.duration:g}s" if args.duration else f"{len(bodies)} requests"
+    print(f"Load test via {args.transport}: {load}, {extent}, workers={config.SOLVER_WORKERS}")
+
+    summaries = []
+    for mode in args.modes:
+        print(f"... {mode}", flush=True)
+        summaries.append(await run_mode(mode, bodies, args))
+
+    for summary in summaries:
+        print_histogram(summary)
+    print_table(summaries)
+
+    if args.json:
+        args.json.write_text(json.dumps(summaries, indent=2), encoding="utf-8")
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test POST /solve across execution modes")
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi",
+                        help="In-process ASGI transport (default) or a local uvicorn server per mode")
+    parser.add_argument("--modes", default=",".join(EXECUTORS),
+                        type=lambda text: [m.strip() for m in text.split(",")],
+                        help="Comma-separated SOLVER_EXECUTION modes to compare")
+    parser.add_argument("--concurrency", type=int, default=8, help="Closed loop: clients in parallel")
+    parser.add_argument("--rate", type=float, help="Open loop: requests started per second")
+    parser.add_argument("--requests", type=int, default=500, help="Synthetic requests to generate")
+    parser.add_argument("--duration", type=float, help="Keep replaying the workload for this many seconds")
+    parser.add_argument("--replay", type=Path, help="Recorded traffic: one expression or JSON body per line")
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help="Synthetic category weights")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests sent first")
+    parser.add_argument("--cold", action="store_true",
+                        help="Disable the result cache and precomputed index to measure raw solver cost")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    unknown = [m for m in args.modes if m not in EXECUTORS]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    asyncio.run(main(args))
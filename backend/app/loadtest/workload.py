@@ -0,0 +1,113 @@
+import json
+import random
+from pathlib import Path
+
+# --------------------------------------------------
+# Synthetic traffic
+#
+# Each category draws from templates with random coefficients, so a run
+# mixes repeated textbook problems (cache/index hits) with fresh ones.
+# --------------------------------------------------
+FUNCTIONS = ["sin", "cos", "tan", "exp", "log", "sqrt"]
+
+DEFAULT_MIX = {"algebra": 4, "derivative": 3, "integral": 2, "limit": 1}
+
+
+def _algebra(rng: random.Random) -> str:
+    r1, r2 = rng.randint(-9, 9), rng.randint(-9, 9)
+    a, b = rng.randint(1, 9), rng.randint(-20, 20)
+    return rng.choice([
+        f"x^2 - ({r1 + r2})x + ({r1 * r2}) = 0",
+        f"{a}x + ({b}) = 0",
+        f"x^3 - {a}x = 0",
+        f"{a}x^2 + {b} = {a + b}",
+    ])
+
+
+def _derivative(rng: random.Random) -> str:
+    f, g = rng.choice(FUNCTIONS), rng.choice(FUNCTIONS)
+    k, n = rng.randint(2, 9), rng.randint(2, 12)
+    return rng.choice([
+        f"d/dx({f}({k}x))",
+        f"d/dx(x^{n})",
+        f"d/dx(x^{n}*{f}(x))",
+        f"d/dx({f}(x)/{g}(x))",
+        f"d/dx({f}({g}(x^{k})))",
+    ])
+
+
+def _integral(rng: random.Random) -> str:
+    f = rng.choice(["sin", "cos", "exp"])
+    k, n = rng.randint(2, 9), rng.randint(1, 6)
+    return rng.choice([
+        f"integral x^{n} dx",
+        f"integral {f}({k}x) dx",
+        f"integral x^{n}*{f}(x) dx",
+        f"integral 1/(x^2 + {k}) dx",
+        f"integral x*exp({k}x)*sin(x) dx",
+    ])
+
+
+def _limit(rng: random.Random) -> str:
+    k = rng.randint(1, 9)
+    return rng.choice([
+        f"lim x->0 sin({k}x)/x",
+        f"lim x->{k} (x^2-{k * k})/(x-{k})",
+        f"lim x->0 (1-cos({k}x))/x^2",
+        f"lim x->oo (1+{k}/x)^x",
+        "lim x->0 (exp(x)-1)/x",
+    ])
+
+
+GENERATORS = {
+    "algebra": _algebra,
+    "derivative": _derivative,
+    "integral": _integral,
+    "limit": _limit,
+}
+
+
+def parse_mix(text: str) -> dict:
+    """
+    Parses "algebra=4,derivative=3" into {"algebra": 4.0, "derivative": 3.0}.
+    """
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in GENERATORS:
+            raise ValueError(f"Unknown category {name!r} (expected one of {', '.join(GENERATORS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def synthetic_workload(count: int, mix: dict = None, seed: int = 0) -> list:
+    """
+    Returns `count` request bodies drawn from the weighted category mix.
+    """
+    mix = mix or DEFAULT_MIX
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    return [
+        {"expression": GENERATORS[rng.choices(names, weights)[0]](rng)}
+        for _ in range(count)
+    ]
+
+
+def load_replay(path: Path) -> list:
+    """
+    Reads recorded traffic: one request per line, either a bare expression
+    or a JSON /solve body such as {"expression": "...", "x_min": -2}.
+    Blank lines and lines starting with # are skipped.
+    """
+    bodies = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            bodies.append(json.loads(line))
+        else:
+            bodies.append({"expression": line})
+    return bodies
@@ -1,11 +1,31 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes.solve import router as solve_router
+from app.routes.metrics import router as metrics_router
+from app.routes.session import router as session_router
+from app import config
+from app.utils.compression import CompressionMiddleware
+from app.solver.registry import registry
+from app.utils.serialization import FastJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start the fast lane's workers up front so the first request doesn't
+    # wait for them (the heavy lane starts on demand)
+    registry.start()
+    yield
+    registry.shutdown()
+
 
 app = FastAPI(
     title="AI Math Solver",
     description="Solve math problems with step-by-step explanations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -16,8 +36,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# API routes (e.g. POST /solve)
+# gzip/brotli for graph-heavy responses
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=config.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=config.GZIP_LEVEL,
+    brotli_quality=config.BROTLI_QUALITY,
+)
+
+# API routes (e.g. POST /solve, WS /solve/ws)
 app.include_router(solve_router)
+app.include_router(session_router)
+app.include_router(metrics_router)
 
 @app.get("/")
 def health_check():
@@ -0,0 +1,134 @@
+"""
+Offline build of the precomputed answer index.
+
+Run from backend/:
+    python -m app.precomputed.build_index [--extra problems.txt] [--output path]
+"""
+import argparse
+import time
+from pathlib import Path
+
+from app import config
+from app.precomputed.index import write_index
+from app.solver.registry import registry
+from app.utils.detector import detect_problem_type
+from app.utils.serialization import dumps
+
+# --------------------------------------------------
+# Curated corpus of high-frequency textbook problems
+# --------------------------------------------------
+FUNCTIONS = ["sin", "cos", "tan", "exp", "log", "sqrt"]
+
+
+def signed(value: int, term: str = "") -> str:
+    if value == 0:
+        return ""
+    sign = "-" if value < 0 else "+"
+    magnitude = abs(value)
+    coefficient = "" if term and magnitude == 1 else str(magnitude)
+    return f" {sign} {coefficient}{term}"
+
+
+def generate_corpus():
+    problems = []
+
+    # Derivatives of elementary functions and powers
+    for f in FUNCTIONS:
+        problems.append(f"d/dx({f}(x))")
+        for k in range(2, 11):
+            problems.append(f"d/dx({f}({k}x))")
+    for n in range(2, 21):
+        problems.append(f"d/dx(x^{n})")
+    problems += [
+        "d/dx(x*sin(x))",
+        "d/dx(x*exp(x))",
+        "d/dx(x*log(x))",
+        "d/dx(sin(x)*cos(x))",
+        "d/dx(exp(x)*sin(x))",
+        "d/dx(sin(x)/x)",
+        "d/dx(1/x)",
+        "d/dx(cot(x^3))",
+    ]
+
+    # Integrals of powers and elementary functions
+    for n in range(0, 11):
+        problems.append(f"integral x^{n} dx")
+    for f in ["sin", "cos", "exp"]:
+        problems.append(f"integral {f}(x) dx")
+        for k in range(2, 11):
+            problems.append(f"integral {f}({k}x) dx")
+    problems += ["integral 1/x dx", "integral log(x) dx", "integral x*exp(x) dx"]
+
+    # Standard limits
+    problems.append("lim x->0 sin(x)/x")
+    for k in range(2, 11):
+        problems.append(f"lim x->0 sin({k}x)/x")
+    for k in range(1, 11):
+        problems.append(f"lim x->{k} (x^2-{k * k})/(x-{k})")
+    problems += [
+        "lim x->0 (1-cos(x))/x^2",
+        "lim x->0 (exp(x)-1)/x",
+        "lim x->0 log(1+x)/x",
+        "lim x->0 tan(x)/x",
+        "lim x->oo (1+1/x)^x",
+        "lim x->oo 1/x",
+        "lim x->infinity 1/x",
+    ]
+
+    # Linear equations and quadratics with integer roots
+    for a in range(1, 11):
+        for b in range(-10, 11):
+            problems.append(f"{a if a != 1 else ''}x{signed(b)} = 0")
+    for r1 in range(-10, 11):
+        for r2 in range(r1, 11):
+            problems.append(f"x^2{signed(-(r1 + r2), 'x')}{signed(r1 * r2)} = 0")
+
+    return problems
+
+
+def is_answer(result: dict) -> bool:
+    return bool(result["steps"]) and result["solution"] != "Error"
+
+
+def build(expressions, output: Path):
+    entries = {}
+    skipped = 0
+    start = time.perf_counter()
+
+    for expression in expressions:
+        problem_type = detect_problem_type(expression)
+        solver = registry.get(problem_type)
+        if solver is None:
+            skipped += 1
+            continue
+
+        result = solver.run(expression)
+        if not is_answer(result):
+            skipped += 1
+            continue
+
+        entries[expression] = dumps(result)
+
+    write_index(str(output), entries)
+    size_kb = output.stat().st_size / 1024
+    print(
+        f"✅ Indexed {len(entries)} problems ({skipped} skipped) "
+        f"into {output} [{size_kb:.0f} KB] in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the precomputed answer index")
+    parser.add_argument("--extra", type=Path, help="File with one extra problem per line")
+    parser.add_argument("--output", type=Path, default=Path(config.PRECOMPUTED_INDEX_PATH))
+    args = parser.parse_args()
+
+    expressions = generate_corpus()
+    if args.extra:
+        expressions += [
+            line.strip()
+            for line in args.extra.read_text(encoding="utf-8").splitlines()
+            if line.strip() and not line.startswith("#")
+        ]
+
+    build(expressions, args.output)
@@ -0,0 +1,166 @@
+import hashlib
+import mmap
+import os
+import struct
+
+from app import config
+from app.solver.parsing import normalize
+
+# --------------------------------------------------
+# File layout (little-endian)
+#
+#   header   MAGIC, format version, slot count, entry count, fingerprint length
+#   fprint   settings fingerprint (utf-8), padded to 8 bytes
+#   slots    slot_count * (key hash u64, record offset u64, record length u32, pad u32)
+#   records  expression length u32, expression (utf-8), JSON-encoded /solve response
+#
+# Slots form an open-addressing hash table (linear probing, power-of-two
+# size, at most half full), so a lookup touches one or two slots.
+# --------------------------------------------------
+MAGIC = b"AMSIDX\x00\x00"
+FORMAT_VERSION = 2
+
+HEADER = struct.Struct("<8sIIQI")
+SLOT = struct.Struct("<QQII")
+RECORD = struct.Struct("<I")
+
+
+def key_hash(expression: str) -> int:
+    """
+    Stable 64-bit hash of the normalized expression (never 0, which marks empty slots).
+    """
+    digest = hashlib.blake2b(normalize(expression).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+def settings_fingerprint() -> str:
+    """
+    Settings that shape stored responses; a mismatch disables the index.
+    """
+    return (
+        f"graph_points={config.GRAPH_POINTS};graph_precision={config.GRAPH_PRECISION};"
+        f"verify_points={config.VERIFY_POINTS}"
+    )
+
+
+def _padded(length: int) -> int:
+    return (length + 7) // 8 * 8
+
+
+def write_index(path: str, entries: dict):
+    """
+    Writes {expression: response bytes} to `path` in the index format.
+    """
+    fingerprint = settings_fingerprint().encode("utf-8")
+
+    slot_count = 1
+    while slot_count < max(len(entries), 1) * 2:
+        slot_count *= 2
+    mask = slot_count - 1
+
+    data_start = HEADER.size + _padded(len(fingerprint)) + slot_count * SLOT.size
+
+    slots = [(0, 0, 0)] * slot_count
+    owners = {}
+    records = []
+    offset = data_start
+    for expression, payload in entries.items():
+        h = key_hash(expression)
+        key = normalize(expression)
+        i = h & mask
+        # Probe past other keys, including ones that merely share the hash
+        while slots[i][0] != 0 and owners[i] != key:
+            i = (i + 1) & mask
+        owners[i] = key
+        encoded = expression.encode("utf-8")
+        record = RECORD.pack(len(encoded)) + encoded + payload
+        slots[i] = (h, offset, len(record))
+        records.append(record)
+        offset += len(record)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, slot_count, len(entries), len(fingerprint)))
+        f.write(fingerprint.ljust(_padded(len(fingerprint)), b"\x00"))
+        for h, off, length in slots:
+            f.write(SLOT.pack(h, off, length, 0))
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, path)
+
+
+class PrecomputedIndex:
+    """
+    Read-only, memory-mapped view of a built answer index.
+    Worker processes share the mapped pages through the OS page cache.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.entries = 0
+        self._map = None
+        self._mask = 0
+        self._slots_start = 0
+
+        if path and os.path.exists(path):
+            self._open(path)
+
+    def _open(self, path: str):
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return
+
+        try:
+            magic, version, slot_count, entries, fp_len = HEADER.unpack_from(mapped, 0)
+            fingerprint = bytes(mapped[HEADER.size:HEADER.size + fp_len]).decode("utf-8")
+        except (struct.error, UnicodeDecodeError):
+            mapped.close()
+            return
+
+        if (
+            magic != MAGIC
+            or version != FORMAT_VERSION
+            or fingerprint != settings_fingerprint()
+            or slot_count & (slot_count - 1)
+        ):
+            # Stale or foreign file: serve everything live instead
+            mapped.close()
+            return
+
+        self._map = mapped
+        self._mask = slot_count - 1
+        self._slots_start = HEADER.size + _padded(fp_len)
+        self.entries = entries
+
+    def lookup(self, expression: str):
+        """
+        Returns (stored expression, response bytes) for `expression`, or None.
+        """
+        if self._map is None:
+            return None
+
+        h = key_hash(expression)
+        key = normalize(expression)
+        i = h & self._mask
+        while True:
+            stored, offset, length, _ = SLOT.unpack_from(self._map, self._slots_start + i * SLOT.size)
+            if stored == 0:
+                return None
+            if stored == h:
+                (expr_len,) = RECORD.unpack_from(self._map, offset)
+                start = offset + RECORD.size
+                stored_expression = self._map[start:start + expr_len].decode("utf-8")
+                # A hash match alone could be a different problem
+                if normalize(stored_expression) == key:
+                    return stored_expression, self._map[start + expr_len:offset + length]
+            i = (i + 1) & self._mask
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+index = PrecomputedIndex(config.PRECOMPUTED_INDEX_PATH)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from app.solver import memory
+from app.utils import metrics
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("")
+def get_metrics():
+    metrics.set_gauge("memory.server.rss_mb", round(memory.rss_bytes() / memory.MB, 1))
+    return metrics.snapshot()
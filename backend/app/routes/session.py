@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from app import config
+from app.solver.registry import SolverFailed, SolverRejected, SolverTimeout
+from app.solver.session import SolveSession
+from app.utils import metrics
+from app.utils.serialization import dumps
+
+router = APIRouter(prefix="/solve", tags=["Solver"])
+
+
+async def send(websocket: WebSocket, message: dict):
+    await websocket.send_text(dumps(message).decode("utf-8"))
+
+
+async def send_error(websocket: WebSocket, message: dict, detail: str):
+    await send(websocket, {"type": "error", "id": message.get("id"), "detail": detail})
+
+
+async def handle_expression(websocket: WebSocket, session: SolveSession, message: dict):
+    # Debounce: a newer keystroke cancels this task while it sleeps
+    await asyncio.sleep(config.SESSION_DEBOUNCE_SECONDS)
+
+    try:
+        result = await session.update_expression(
+            message.get("expression", ""), bool(message.get("trace", False))
+        )
+    except (SolverTimeout, SolverRejected, SolverFailed) as e:
+        await send_error(websocket, message, str(e))
+        return
+    except Exception as e:
+        # These run as detached tasks: report the failure instead of losing it
+        metrics.increment("session.errors")
+        await send_error(websocket, message, f"Could not solve the expression: {e}")
+        return
+
+    if result is not None:
+        await send(websocket, {"type": "result", "id": message.get("id"), "result": result})
+
+    await handle_graph(websocket, session, message)
+
+
+async def handle_graph(websocket: WebSocket, session: SolveSession, message: dict):
+    try:
+        graph = await run_in_threadpool(session.graph)
+    except Exception as e:
+        metrics.increment("session.errors")
+        await send_error(websocket, message, f"Could not plot the expression: {e}")
+        return
+    if graph is not None:
+        await send(websocket, {"type": "graph", "id": message.get("id"), **graph})
+
+
+@router.websocket("/ws")
+async def solve_session(websocket: WebSocket):
+    """
+    Live solving over a WebSocket.
+
+    Client messages:
+    - {"type": "expression", "expression": "d/dx x^2", "id": 1}
+      (add "trace": true for rule-by-rule steps, as with POST /solve)
+    - {"type": "window", "x_min": -2, "x_max": 2, "points": 200, "id": 2}
+
+    Server messages: "result" (same body as POST /solve), "graph"
+    (sampled series for the current window) and "error".
+    """
+    await websocket.accept()
+    session = SolveSession()
+    tasks = {}
+
+    def supersede(*kinds):
+        for kind in kinds:
+            task = tasks.pop(kind, None)
+            if task is not None and not task.done():
+                task.cancel()
+                metrics.increment("session.superseded")
+
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await send_error(websocket, {}, "Messages must be JSON objects")
+                continue
+
+            kind = message.get("type")
+
+            if kind == "expression":
+                supersede("expression", "window")
+                tasks["expression"] = asyncio.create_task(
+                    handle_expression(websocket, session, message)
+                )
+
+            elif kind == "window":
+                try:
+                    session.set_window(
+                        message["x_min"],
+                        message["x_max"],
+                        message.get("points", config.GRAPH_POINTS)
+                    )
+                except (KeyError, TypeError, ValueError) as e:
+                    await send_error(websocket, message, str(e))
+                    continue
+
+                # A pending solve picks up the new window when it finishes
+                if "expression" in tasks and not tasks["expression"].done():
+                    continue
+
+                supersede("window")
+                tasks["window"] = asyncio.create_task(
+                    handle_graph(websocket, session, message)
+                )
+
+            else:
+                await send_error(websocket, message, f"Unknown message type: {kind}")
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks.values():
+            task.cancel()
@@ -1,30 +1,76 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request, Response
 from app.schemas.solve import SolveRequest, SolveResponse
 from app.utils.detector import detect_problem_type
-from app.solver.algebra import solve_algebra
-from app.solver.calculus import solve_calculus
-from app.solver.limits import solve_limits
+from app.solver.registry import registry, SolverCancelled, SolverFailed, SolverRejected, SolverTimeout
+from app.precomputed.index import index as precomputed
+from app.utils import metrics
+from app.utils.serialization import FastJSONResponse, loads
 
 router = APIRouter(prefix="/solve", tags=["Solver"])
 
 
-@router.post("", response_model=SolveResponse)
-def solve_problem(request: SolveRequest):
-    problem_type = detect_problem_type(request.expression)
+def precomputed_response(request: SolveRequest):
+    """
+    Serves default-window, untraced requests straight from the precomputed index.
+    """
+    if request.trace or request.window() != (None, None, None):
+        return None
+
+    hit = precomputed.lookup(request.expression)
+    if hit is None:
+        metrics.increment("precomputed.misses")
+        return None
+
+    metrics.increment("precomputed.hits")
+    stored_expression, payload = hit
+    if stored_expression == request.expression:
+        return Response(content=payload, media_type="application/json")
+
+    # Same problem with different spacing: echo the caller's input, including
+    # in steps that quote it (e.g. "Given equation: ...")
+    result = loads(payload)
+    result["original_expression"] = request.expression
+    result["steps"] = [step.replace(stored_expression, request.expression) for step in result["steps"]]
+    return FastJSONResponse(result)
 
-    if problem_type == "algebra":
-        return solve_algebra(request.expression)
 
-    if problem_type in ["calculus", "trigonometry"]:
-        return solve_calculus(request.expression)
+async def wait_for_disconnect(http_request: Request):
+    """
+    Resolves when the client goes away (tab closed, request aborted/retried).
+    The body has already been read, so the next ASGI message is the disconnect.
+    """
+    while True:
+        message = await http_request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+@router.post("", response_model=SolveResponse)
+async def solve_problem(request: SolveRequest, http_request: Request):
+    cached = precomputed_response(request)
+    if cached is not None:
+        return cached
+
+    problem_type = detect_problem_type(request.expression)
 
-    if problem_type == "limits":
-        return solve_limits(request.expression)
+    try:
+        result, _, _ = await registry.solve_with_state_async(
+            problem_type,
+            request.expression,
+            request.window(),
+            trace=request.trace,
+            disconnected=wait_for_disconnect(http_request)
+        )
+    except SolverTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except SolverRejected as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except SolverFailed as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except SolverCancelled:
+        # Nobody is listening any more; 499 = client closed request
+        return Response(status_code=499)
 
-    return {
-        "problem_type": problem_type,
-        "original_expression": request.expression,
-        "solution": "Solver not implemented yet",
-        "steps": [],
-        "latex": ""
-    }
\ No newline at end of file
+    # Solvers already build the response shape, so skip re-validating
+    # the (graph-heavy) dict and encode it directly
+    return FastJSONResponse(result)
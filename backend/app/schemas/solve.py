@@ -1,12 +1,39 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
+
+from app import config
 
 class SolveRequest(BaseModel):
     expression: str
 
+    # Optional graph window; omitted values fall back to the solver's default
+    x_min: Optional[float] = Field(None, ge=-config.GRAPH_MAX_ABS_X, le=config.GRAPH_MAX_ABS_X)
+    x_max: Optional[float] = Field(None, ge=-config.GRAPH_MAX_ABS_X, le=config.GRAPH_MAX_ABS_X)
+    points: Optional[int] = Field(None, ge=2, le=config.GRAPH_MAX_POINTS)
+
+    # Replace the generic steps with the rules actually applied (derivatives,
+    # integrals, limits); off by default since tracing costs extra work
+    trace: bool = False
+
+    @model_validator(mode="after")
+    def check_window(self):
+        if self.x_min is not None and self.x_max is not None and self.x_max <= self.x_min:
+            raise ValueError("x_max must be greater than x_min")
+        return self
+
+    def window(self):
+        return (self.x_min, self.x_max, self.points)
+
 class SolveResponse(BaseModel):
     problem_type: str
     original_expression: str
     solution: str
     steps: List[str]
-    latex: str
\ No newline at end of file
+    latex: str
+    graph: Optional[Dict[str, Any]] = None
+    # Derivatives and integrals only: True if the answer agreed with a
+    # numeric check, False if it didn't, None if it couldn't be checked
+    verified: Optional[bool] = None
+    # Only when "trace" was requested: True if steps are the traced rules,
+    # False if tracing failed and the generic steps were kept
+    traced: Optional[bool] = None
@@ -1,47 +1,42 @@
-from sympy import symbols, Eq, solve
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor
-)
-
-# Define supported symbols (extend later if needed)
-x, y, z = symbols("x y z")
-
-# Allow implicit multiplication: 2x, 3xy, 4(x+1)
-TRANSFORMATIONS = standard_transformations + (
-    implicit_multiplication_application,
-    convert_xor,
-)
+from sympy import Eq, solve
 
-def solve_algebra(expression: str):
-    expr = expression.replace(" ", "")
+from app.solver.complexity import estimate
+from app.solver.parsing import parse
+from app.solver.registry import Solver, register
 
-    if "=" not in expr:
-        return {
-            "problem_type": "algebra",
-            "original_expression": expression,
-            "solution": "Invalid equation. Please include '='.",
-            "steps": [],
-            "latex": ""
-        }
 
-    left, right = expr.split("=", 1)
+@register("algebra")
+class AlgebraSolver(Solver):
+    problem_type = "algebra"
+
+    def prepare(self, expression: str) -> dict:
+        expr = expression.replace(" ", "")
 
-    try:
-        left_expr = parse_expr(
-            left,
-            transformations=TRANSFORMATIONS,
-            local_dict={"x": x, "y": y, "z": z}
-        )
-        right_expr = parse_expr(
-            right,
-            transformations=TRANSFORMATIONS,
-            local_dict={"x": x, "y": y, "z": z}
-        )
+        if "=" not in expr:
+            return {"expression": expression, "equation": None}
 
-        equation = Eq(left_expr, right_expr)
+        left, right = expr.split("=", 1)
+        equation = Eq(parse(left), parse(right))
+
+        return {"expression": expression, "equation": equation}
+
+    def complexity(self, prepared: dict):
+        if prepared["equation"] is None:
+            return None
+        return estimate(prepared["equation"], "equation")
+
+    def solve(self, prepared: dict) -> dict:
+        expression = prepared["expression"]
+        equation = prepared["equation"]
+
+        if equation is None:
+            return {
+                "problem_type": "algebra",
+                "original_expression": expression,
+                "solution": "Invalid equation. Please include '='.",
+                "steps": [],
+                "latex": ""
+            }
 
         # Solve for all symbols found in the equation
         symbols_in_eq = list(equation.free_symbols)
@@ -71,11 +66,15 @@ def solve_algebra(expression: str):
             "latex": str(equation)
         }
 
-    except Exception as e:
+    def error(self, expression: str, exc: Exception) -> dict:
         return {
             "problem_type": "algebra",
             "original_expression": expression,
-            "solution": f"Could not solve the equation: {str(e)}",
+            "solution": f"Could not solve the equation: {str(exc)}",
             "steps": [],
             "latex": ""
-        }
\ No newline at end of file
+        }
+
+
+def solve_algebra(expression: str):
+    return AlgebraSolver().run(expression)
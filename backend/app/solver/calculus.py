@@ -1,167 +1,244 @@
-from sympy import symbols, integrate, diff, sympify, latex, sin, cos, tan, limit, Eq, solve
-x, y = symbols("x y")
 import re
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-)
-
-import numpy as np
-
-def generate_graph_data(sym_expr, var=x, start=-10, end=10, num=400):
-    xs = np.linspace(start, end, num)
-    ys = []
-
-    for val in xs:
-        try:
-            y_val = sym_expr.subs(var, val)
-            y_val = float(y_val)
-            ys.append(y_val)
-        except Exception:
-            ys.append(None)
-
-    return {
-        "x": xs.tolist(),
-        "y": ys
-    }
-
-TRANSFORMATIONS = standard_transformations + (
-    implicit_multiplication_application,
-)
 
-def solve_calculus(expression: str):
+from sympy import integrate, diff, idiff, latex
+
+from app.solver.complexity import estimate
+from app.solver.contour import implicit_graph_data
+from app.solver.limits import LimitsSolver
+from app.solver.parsing import parse, x, y
+from app.solver.registry import Solver, register
+from app.solver.trace import trace_derivative, trace_implicit, trace_integral
+from app.solver.verify import verify_antiderivative, verify_derivative
+
+# Rewrite `sin(3x)` / `sin3x` style input into explicit products
+TRIG_PATTERNS = [
+    (r"sin\((\d+)x\)", r"sin(\1*x)"),
+    (r"cos\((\d+)x\)", r"cos(\1*x)"),
+    (r"tan\((\d+)x\)", r"tan(\1*x)"),
+    (r"sin(\d+)x", r"sin(\1*x)"),
+    (r"cos(\d+)x", r"cos(\1*x)"),
+    (r"tan(\d+)x", r"tan(\1*x)")
+]
+
+
+@register("calculus", "trigonometry")
+class CalculusSolver(Solver):
     """
     Handles:
     - Integrals: integrate x^2 dx
     - Derivatives: d/dx(sin(3x))
     - Implicit differentiation: x^2 + y^2 = 1
-    - Limits: lim x->0 sin(x)/x
+    - Limits: lim x->0 sin(x)/x (delegated to the limits solver)
     """
 
-    expr = expression.replace("^", "**").lower().strip()
+    problem_type = "calculus"
+
+    def __init__(self):
+        self.limits = LimitsSolver()
+
+    def prepare(self, expression: str) -> dict:
+        expr = expression.replace("^", "**").lower().strip()
+
+        # ---------- LIMITS ----------
+        if expr.startswith("lim"):
+            return {
+                "kind": "limit",
+                "expression": expression,
+                "limit": self.limits.prepare(expression)
+            }
+
+        # ---------- DERIVATIVES ----------
+        if expr.startswith("d/dx") or "derivative" in expr:
+            clean_expr = (
+                expr.replace("d/dx", "")
+                .replace("derivative of", "")
+                .strip()
+            )
+
+            if clean_expr.startswith("(") and clean_expr.endswith(")"):
+                clean_expr = clean_expr[1:-1]
+
+            for p, rpl in TRIG_PATTERNS:
+                clean_expr = re.sub(p, rpl, clean_expr)
+
+            return {
+                "kind": "derivative",
+                "expression": expression,
+                "sym_expr": parse(clean_expr)
+            }
+
+        # ---------- IMPLICIT DIFFERENTIATION ----------
+        if "=" in expr:
+            left, right = expr.split("=", 1)
+            return {
+                "kind": "implicit",
+                "expression": expression,
+                "level": parse(left) - parse(right)
+            }
 
-    # ---------- LIMITS ----------
-    if expr.startswith("lim"):
-        match = re.match(r"lim\s+(\w+)->([-\d\.]+)\s+(.*)", expr)
-        if match:
-            var, point, func = match.groups()
-            sym_var = symbols(var)
-            sym_func = parse_expr(func, transformations=TRANSFORMATIONS)
-            result = limit(sym_func, sym_var, sympify(point))
-            graph = generate_graph_data(sym_func)
+        # ---------- INTEGRALS ----------
+        if any(word in expr for word in ("integrate", "integral", "∫")) or expr.endswith("dx"):
+            clean_expr = (
+                expr.replace("integrate", "")
+                .replace("integral of", "")
+                .replace("integral", "")
+                .replace("∫", "")
+                .replace("dx", "")
+                .strip()
+            )
+            return {
+                "kind": "integral",
+                "expression": expression,
+                "sym_expr": parse(clean_expr)
+            }
 
+        return {"kind": "unsupported", "expression": expression}
+
+    def compute(self, prepared: dict):
+        """
+        Derivative, dy/dx or antiderivative of the prepared expression,
+        kept on `prepared` so graphs can reuse it.
+        """
+        if "result" not in prepared:
+            if prepared["kind"] == "derivative":
+                prepared["result"] = diff(prepared["sym_expr"], x)
+            elif prepared["kind"] == "implicit":
+                # F(x, y) = 0  =>  dy/dx = -F_x / F_y
+                prepared["result"] = idiff(prepared["level"], y, x)
+            else:
+                prepared["result"] = integrate(prepared["sym_expr"], x)
+        return prepared["result"]
+
+    def graph_exprs(self, prepared: dict) -> dict:
+        kind = prepared["kind"]
+
+        if kind == "limit":
+            return self.limits.graph_exprs(prepared["limit"])
+
+        if kind == "derivative":
             return {
-                "problem_type": "limits",
+                "original": (prepared["sym_expr"], x),
+                "derivative": (self.compute(prepared), x),
+            }
+
+        if kind == "integral":
+            return {"antiderivative": (self.compute(prepared), x)}
+
+        return {}
+
+    def default_window(self, prepared: dict):
+        if prepared["kind"] == "limit":
+            return self.limits.default_window(prepared["limit"])
+        if prepared["kind"] == "implicit":
+            return (-5.0, 5.0)
+        return super().default_window(prepared)
+
+    def complexity(self, prepared: dict):
+        kind = prepared["kind"]
+        if kind == "limit":
+            return self.limits.complexity(prepared["limit"])
+        if kind == "implicit":
+            return estimate(prepared["level"], "implicit")
+        if kind in ("derivative", "integral"):
+            return estimate(prepared["sym_expr"], kind)
+        return None
+
+    def trace(self, prepared: dict, result: dict):
+        kind = prepared["kind"]
+        solution = result["solution"]
+
+        if kind == "limit":
+            return self.limits.trace(prepared["limit"], result)
+
+        if kind == "derivative":
+            return trace_derivative(prepared["sym_expr"], x) + [f"Simplify: {solution}"]
+
+        if kind == "implicit":
+            return trace_implicit(prepared["level"], x, y) + [f"dy/dx = {solution}"]
+
+        if kind == "integral":
+            return trace_integral(prepared["sym_expr"], x) + [
+                f"Add the constant of integration: {solution} + C"
+            ]
+
+        return None
+
+    def graph(self, prepared: dict, window=None):
+        if prepared["kind"] != "implicit":
+            return super().graph(prepared, window)
+
+        # Level curve F(x, y) = 0 plus the dy/dx field on a 2-D grid
+        x_min, x_max, points = self.resolve_window(prepared, window)
+        return implicit_graph_data(
+            prepared["level"],
+            self.compute(prepared),
+            start=x_min,
+            end=x_max,
+            num=points
+        )
+
+    def solve(self, prepared: dict) -> dict:
+        expression = prepared["expression"]
+        kind = prepared["kind"]
+
+        if kind == "limit":
+            return self.limits.solve(prepared["limit"])
+
+        if kind == "derivative":
+            result = self.compute(prepared)
+
+            return {
+                "problem_type": "calculus",
                 "original_expression": expression,
                 "solution": str(result),
                 "steps": [
-                    f"Take the limit as {var} approaches {point}",
-                    "Evaluate the expression",
-                    "Simplify the result"
+                    "Identify inner and outer functions",
+                    "Apply the chain rule",
+                    "Differentiate and simplify"
                 ],
                 "latex": latex(result),
-                "graph": graph
+                "verified": verify_derivative(prepared["sym_expr"], result)
             }
 
-    # ---------- DERIVATIVES ----------
-    if expr.startswith("d/dx") or "derivative" in expr:
-        clean_expr = (
-            expr.replace("d/dx", "")
-            .replace("derivative of", "")
-            .strip()
-        )
-
-        if clean_expr.startswith("(") and clean_expr.endswith(")"):
-            clean_expr = clean_expr[1:-1]
-
-        patterns = [
-            (r"sin\((\d+)x\)", r"sin(\1*x)"),
-            (r"cos\((\d+)x\)", r"cos(\1*x)"),
-            (r"tan\((\d+)x\)", r"tan(\1*x)"),
-            (r"sin(\d+)x", r"sin(\1*x)"),
-            (r"cos(\d+)x", r"cos(\1*x)"),
-            (r"tan(\d+)x", r"tan(\1*x)")
-        ]
-
-        for p, rpl in patterns:
-            clean_expr = re.sub(p, rpl, clean_expr)
-
-        sym_expr = parse_expr(clean_expr, transformations=TRANSFORMATIONS)
-        result = diff(sym_expr, x)
-        graph = {
-            "original": generate_graph_data(sym_expr),
-            "derivative": generate_graph_data(result),
-        }
+        if kind == "implicit":
+            dydx = self.compute(prepared)
 
-        return {
-            "problem_type": "calculus",
-            "original_expression": expression,
-            "solution": str(result),
-            "steps": [
-                "Identify inner and outer functions",
-                "Apply the chain rule",
-                "Differentiate and simplify"
-            ],
-            "latex": latex(result),
-            "graph": graph
-        }
+            return {
+                "problem_type": "calculus",
+                "original_expression": expression,
+                "solution": str(dydx),
+                "steps": [
+                    "Differentiate both sides with respect to x",
+                    "Treat y as a function of x",
+                    "Solve for dy/dx"
+                ],
+                "latex": latex(dydx)
+            }
 
-    # ---------- IMPLICIT DIFFERENTIATION ----------
-    if "=" in expr:
-        left, right = expr.split("=")
-        left_expr = parse_expr(left, transformations=TRANSFORMATIONS)
-        right_expr = parse_expr(right, transformations=TRANSFORMATIONS)
+        if kind == "integral":
+            result = self.compute(prepared)
 
-        dydx = solve(
-            Eq(
-                diff(left_expr, x) + diff(left_expr, y) * diff(y, x),
-                diff(right_expr, x) + diff(right_expr, y) * diff(y, x)
-            ),
-            diff(y, x)
-        )[0]
+            return {
+                "problem_type": "calculus",
+                "original_expression": expression,
+                "solution": str(result),
+                "steps": [
+                    "Identify the integrand",
+                    "Apply integration rules",
+                    "Add the constant of integration"
+                ],
+                "latex": latex(result),
+                "verified": verify_antiderivative(prepared["sym_expr"], result)
+            }
 
         return {
             "problem_type": "calculus",
             "original_expression": expression,
-            "solution": str(dydx),
-            "steps": [
-                "Differentiate both sides with respect to x",
-                "Treat y as a function of x",
-                "Solve for dy/dx"
-            ],
-            "latex": latex(dydx)
+            "solution": "Unsupported calculus expression",
+            "steps": [],
+            "latex": ""
         }
 
-    # ---------- INTEGRALS ----------
-    if "integrate" in expr or expr.endswith("dx"):
-        clean_expr = (
-            expr.replace("integrate", "")
-            .replace("dx", "")
-            .strip()
-        )
-
-        sym_expr = parse_expr(clean_expr, transformations=TRANSFORMATIONS)
-        result = integrate(sym_expr, x)
-        graph = generate_graph_data(result)
 
-        return {
-            "problem_type": "calculus",
-            "original_expression": expression,
-            "solution": str(result),
-            "steps": [
-                "Identify the integrand",
-                "Apply integration rules",
-                "Add the constant of integration"
-            ],
-            "latex": latex(result),
-            "graph": graph
-        }
-
-    return {
-        "problem_type": "calculus",
-        "original_expression": expression,
-        "solution": "Unsupported calculus expression",
-        "steps": [],
-        "latex": ""
-    }
\ No newline at end of file
+def solve_calculus(expression: str):
+    return CalculusSolver().run(expression)
@@ -0,0 +1,182 @@
+import math
+
+import sympy as sp
+
+# --------------------------------------------------
+# Pre-solve cost estimate
+#
+# Computed from the expression as typed (parsed without evaluation), so it
+# costs a tree walk rather than any algebra. The score is a heuristic in
+# arbitrary units: a plain derivative scores in the single digits, a
+# product of transcendental functions under an integral in the hundreds.
+# Tune the lane thresholds in config against the cost metrics.
+# --------------------------------------------------
+
+# How much harder each operation is than differentiating the same tree
+OPERATION_WEIGHTS = {
+    "derivative": 0.5,
+    "equation": 1.0,
+    "implicit": 1.0,
+    "limit": 2.0,
+    "integral": 3.0,
+}
+
+# Extra cost per occurrence of a function, by family
+FUNCTION_FAMILIES = {
+    "trig": (sp.sin, sp.cos, sp.tan, sp.cot, sp.sec, sp.csc),
+    "inverse_trig": (sp.asin, sp.acos, sp.atan, sp.acot, sp.asec, sp.acsc),
+    "hyperbolic": (sp.sinh, sp.cosh, sp.tanh, sp.coth, sp.asinh, sp.acosh, sp.atanh),
+    "exp_log": (sp.exp, sp.log),
+}
+FAMILY_WEIGHTS = {
+    "trig": 2, "inverse_trig": 8, "hyperbolic": 3, "exp_log": 3, "root": 3, "rational": 2, "other": 4
+}
+
+# Digits of the largest numeric power (2^1000 ~ 300, 9^9^9 ~ 3.7e8) per
+# unit of cost; SymPy computes such powers exactly, digit by digit
+DIGITS_PER_COST = 500
+
+# Stand-in for "more digits than could ever be computed"
+MAX_DIGITS = 1e12
+
+
+def _magnitude(node):
+    """
+    Rough log10 of |node| for a purely numeric subtree, worked out without
+    evaluating it (so 9^9^9^9 comes back as inf), or None if it has symbols.
+    """
+    if node.free_symbols:
+        return None
+    if node.is_Number:
+        value = abs(node)
+        # Factors at or below 1 never make a power bigger
+        return math.log10(value) if value > 1 else 0.0
+    if isinstance(node, sp.Pow):
+        base, exponent = _magnitude(node.base), _magnitude(node.exp)
+        if base is None or exponent is None:
+            return None
+        if exponent > 300:
+            return math.inf if base > 0 else 0.0
+        return base * 10 ** exponent
+    if isinstance(node, sp.exp):
+        argument = _magnitude(node.args[0])
+        if argument is None:
+            return None
+        return math.inf if argument > 300 else math.log10(math.e) * 10 ** argument
+    magnitudes = [_magnitude(arg) for arg in node.args]
+    if any(m is None for m in magnitudes):
+        return None
+    if isinstance(node, sp.Mul):
+        return sum(magnitudes)
+    return max(magnitudes, default=0.0)
+
+
+def _family(node) -> str:
+    if isinstance(node, sp.Pow):
+        exponent = node.exp
+        if exponent.is_Rational and not exponent.is_Integer:
+            return "root"
+        return None
+    if not isinstance(node, sp.Function):
+        return None
+    for family, functions in FUNCTION_FAMILIES.items():
+        if isinstance(node, functions):
+            return family
+    return "other"
+
+
+def _children(node):
+    # Unevaluated input nests Add/Mul as typed, e.g. ((a + b) + c);
+    # flatten so a long sum doesn't read as deep nesting
+    for arg in node.args:
+        if arg.func is node.func and node.func in (sp.Add, sp.Mul):
+            yield from _children(arg)
+        else:
+            yield arg
+
+
+def estimate(sym_expr, operation: str) -> dict:
+    """
+    Returns {"nodes", "depth", "functions", "degree", "digits", "cost"} for solving
+    `sym_expr` with `operation` (one of OPERATION_WEIGHTS).
+
+    - nodes: operators, functions and atoms in the (flattened) tree
+    - depth: longest root-to-leaf path
+    - functions: occurrences per family (trig, exp_log, root, ...), plus
+      "rational" for divisions by something containing a symbol
+    - degree: highest integer power applied to anything containing a symbol
+    - digits: size of the largest purely numeric power, e.g. 10^100 -> 100
+    """
+    nodes = 0
+    depth = 0
+    functions = {}
+    degree = 0
+    denominator_degree = 0
+    nested = 0
+    digits = 0.0
+
+    # (node, depth, inside a denominator)
+    stack = [(sym_expr, 1, False)]
+    while stack:
+        node, level, below = stack.pop()
+        nodes += 1
+        depth = max(depth, level)
+
+        family = _family(node)
+        if family is not None:
+            functions[family] = functions.get(family, 0) + 1
+            # sin(x^2), exp(1/x): arguments that are not linear in x
+            if isinstance(node, sp.Function) and any(arg.has(sp.Pow, sp.Function) for arg in node.args):
+                nested += 1
+
+        power = 0
+        if isinstance(node, sp.Pow) and not node.base.free_symbols:
+            # 9^9^9^9 is typed in a few characters but can't be computed
+            magnitude = _magnitude(node)
+            if magnitude is not None:
+                digits = max(digits, min(magnitude, MAX_DIGITS))
+        elif isinstance(node, sp.Pow) and node.exp.is_Integer:
+            power = abs(int(node.exp))
+            if node.exp.is_negative:
+                functions["rational"] = functions.get("rational", 0) + 1
+                below = True
+        elif isinstance(node, sp.Pow) and not node.exp.free_symbols:
+            # x^(10^10) arrives unevaluated; only the exponent's size matters
+            exponent = _magnitude(node.exp)
+            if exponent > 3:
+                power = int(MAX_DIGITS) if exponent > 12 else int(10 ** exponent)
+        elif node.is_Symbol:
+            power = 1
+        degree = max(degree, power)
+        if below:
+            denominator_degree = max(denominator_degree, power)
+
+        stack.extend((child, level + 1, below) for child in _children(node))
+
+    score = nodes + 2 * depth + 2 * min(degree, 50) + 6 * nested + digits / DIGITS_PER_COST
+    score += sum(FAMILY_WEIGHTS[family] * count for family, count in functions.items())
+
+    # No general closed form beyond quartics
+    if operation == "equation" and degree > 4:
+        score += 20 * (degree - 4)
+
+    # Partial fractions over irreducible cubics and up get expensive
+    if operation == "integral":
+        score += 25 * max(0, min(denominator_degree, 20) - 2)
+
+    # Mixing function families (log(x)*atan(x), exp(x^2)*log(x)/(1+x^3))
+    # is where integration and limit algorithms blow up. Limits are
+    # nearly always quotients, so division alone doesn't count there.
+    if operation in ("integral", "limit"):
+        families = [f for f in functions if operation == "integral" or f != "rational"]
+        if len(families) > 1:
+            score *= len(families)
+
+    return {
+        "nodes": nodes,
+        "depth": depth,
+        "functions": functions,
+        "degree": degree,
+        "digits": round(digits, 1),
+        "cost": round(score * OPERATION_WEIGHTS[operation], 1)
+    }
@@ -0,0 +1,213 @@
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+
+from app import config
+from app.solver.graph import to_json_floats
+from app.solver.parsing import x, y
+
+
+@lru_cache(maxsize=128)
+def compile_function_2d(sym_expr, var_x=x, var_y=y):
+    return sp.lambdify((var_x, var_y), sym_expr, modules=["numpy"])
+
+
+def evaluate_grid(sym_expr, xs, ys):
+    """
+    Evaluates sym_expr(x, y) on the meshgrid of xs and ys in one vectorized
+    call. Rows follow ys, columns follow xs; undefined values become NaN.
+    """
+    gx, gy = np.meshgrid(xs, ys)
+    try:
+        f = compile_function_2d(sym_expr)
+        with np.errstate(all="ignore"):
+            values = np.broadcast_to(np.asarray(f(gx, gy)), gx.shape)
+    except Exception:
+        return np.full(gx.shape, np.nan)
+
+    if np.iscomplexobj(values):
+        values = np.where(values.imag == 0, values.real, np.nan)
+
+    try:
+        return values.astype(float)
+    except (TypeError, ValueError):
+        return np.full(gx.shape, np.nan)
+
+
+def rows_per_chunk(nx: int, budget_bytes: int = None) -> int:
+    """
+    Grid rows evaluated at once so a chunk (plus NumPy temporaries,
+    assumed ~16 arrays of the same size) stays within the memory budget.
+    """
+    if budget_bytes is None:
+        budget_bytes = config.IMPLICIT_GRID_BUDGET_BYTES
+    return max(2, budget_bytes // (nx * 8 * 16))
+
+
+# --------------------------------------------------
+# Marching squares
+#
+# Cell corners: bl = V[j, i], br = V[j, i+1], tl = V[j+1, i], tr = V[j+1, i+1]
+# Edges get global ids: horizontal edge from (j, i) to (j, i+1) -> 2 * (j*nx + i),
+# vertical edge from (j, i) to (j+1, i) -> 2 * (j*nx + i) + 1.
+# Neighbouring cells compute identical ids for a shared edge, which is what
+# lets segments be stitched into polylines across chunks.
+# --------------------------------------------------
+def _cell_segments(values, row_offset, nx):
+    bl = values[:-1, :-1]
+    br = values[:-1, 1:]
+    tl = values[1:, :-1]
+    tr = values[1:, 1:]
+
+    valid = np.isfinite(bl) & np.isfinite(br) & np.isfinite(tl) & np.isfinite(tr)
+    pbl, pbr, ptl, ptr = bl > 0, br > 0, tl > 0, tr > 0
+
+    crossed = {
+        "b": valid & (pbl != pbr),
+        "r": valid & (pbr != ptr),
+        "t": valid & (ptl != ptr),
+        "l": valid & (pbl != ptl),
+    }
+
+    rows, cols = np.indices(bl.shape)
+    rows = rows + row_offset
+    edge_ids = {
+        "b": 2 * (rows * nx + cols),
+        "t": 2 * ((rows + 1) * nx + cols),
+        "l": 2 * (rows * nx + cols) + 1,
+        "r": 2 * (rows * nx + cols + 1) + 1,
+    }
+
+    count = sum(c.astype(int) for c in crossed.values())
+    starts, ends = [], []
+
+    simple = count == 2
+    for a, b in (("b", "r"), ("b", "t"), ("b", "l"), ("r", "t"), ("r", "l"), ("t", "l")):
+        mask = simple & crossed[a] & crossed[b]
+        starts.append(edge_ids[a][mask])
+        ends.append(edge_ids[b][mask])
+
+    # Saddles: use the cell centre to decide which corners are cut off
+    saddle = count == 4
+    if saddle.any():
+        centre_positive = (bl + br + tl + tr) / 4 > 0
+        same = saddle & (centre_positive == pbl)
+        other = saddle & (centre_positive != pbl)
+        for mask, pairs in ((same, (("b", "r"), ("t", "l"))), (other, (("l", "b"), ("t", "r")))):
+            for a, b in pairs:
+                starts.append(edge_ids[a][mask])
+                ends.append(edge_ids[b][mask])
+
+    return np.concatenate(starts), np.concatenate(ends)
+
+
+def _edge_point(edge_id, values, row_offset, xs, ys, nx):
+    cell, vertical = divmod(int(edge_id), 2)
+    j, i = divmod(cell, nx)
+    local = j - row_offset
+    v0 = values[local, i]
+    if vertical:
+        v1 = values[local + 1, i]
+        t = v0 / (v0 - v1)
+        return xs[i], ys[j] + t * (ys[j + 1] - ys[j])
+    v1 = values[local, i + 1]
+    t = v0 / (v0 - v1)
+    return xs[i] + t * (xs[i + 1] - xs[i]), ys[j]
+
+
+def _stitch(segments, points):
+    """
+    Joins segments that share an edge into polylines.
+    Returns flat x/y lists with None between separate polylines.
+    """
+    neighbours = {}
+    for a, b in segments:
+        neighbours.setdefault(a, []).append(b)
+        neighbours.setdefault(b, []).append(a)
+
+    visited = set()
+    out_x, out_y = [], []
+
+    def walk(start):
+        line = [start]
+        visited.add(start)
+        current = start
+        while True:
+            nxt = next((n for n in neighbours[current] if n not in visited), None)
+            if nxt is None:
+                # Close loops back onto their first point
+                if start in neighbours[current] and len(line) > 2:
+                    line.append(start)
+                return line
+            visited.add(nxt)
+            line.append(nxt)
+            current = nxt
+
+    # Open curves first (start at an end point), then closed loops
+    ordered = [e for e, n in neighbours.items() if len(n) == 1]
+    ordered += [e for e in neighbours if len(neighbours[e]) != 1]
+    for edge in ordered:
+        if edge in visited:
+            continue
+        if out_x:
+            out_x.append(None)
+            out_y.append(None)
+        for e in walk(edge):
+            px, py = points[e]
+            out_x.append(px)
+            out_y.append(py)
+
+    return out_x, out_y
+
+
+def implicit_graph_data(level_expr, slope_expr, start=-5, end=5, num=None):
+    """
+    Samples F(x, y) on a square grid over [start, end]^2 and returns:
+    - "curve": the level set F = 0 as polylines (None-separated x/y lists)
+    - "grid" and "dydx": the slope field dy/dx, one row per y, on a coarse
+      grid of IMPLICIT_SLOPE_POINTS per axis whatever the curve resolution
+
+    The curve grid is evaluated in row chunks bounded by
+    IMPLICIT_GRID_BUDGET_BYTES.
+    """
+    if num is None:
+        num = config.IMPLICIT_GRID_POINTS
+    num = min(num, config.IMPLICIT_MAX_GRID_POINTS)
+
+    xs = np.linspace(start, end, num)
+    ys = np.linspace(start, end, num)
+    step = rows_per_chunk(num)
+
+    segments = []
+    points = {}
+
+    for r0 in range(0, num - 1, step):
+        # Chunks overlap by one row so no cell is skipped
+        r1 = min(r0 + step, num - 1)
+        chunk_ys = ys[r0:r1 + 1]
+        values = evaluate_grid(level_expr, xs, chunk_ys)
+
+        starts, ends = _cell_segments(values, r0, num)
+        for a, b in zip(starts.tolist(), ends.tolist()):
+            for e in (a, b):
+                if e not in points:
+                    points[e] = _edge_point(e, values, r0, xs, ys, num)
+            segments.append((a, b))
+
+    curve_x, curve_y = _stitch(segments, points)
+
+    slope_xs = np.linspace(start, end, config.IMPLICIT_SLOPE_POINTS)
+    slopes = evaluate_grid(slope_expr, slope_xs, slope_xs)
+
+    return {
+        "curve": {
+            "x": to_json_floats(np.array(curve_x, dtype=float)),
+            "y": to_json_floats(np.array(curve_y, dtype=float))
+        },
+        "grid": {
+            "x": to_json_floats(slope_xs),
+            "y": to_json_floats(slope_xs)
+        },
+        "dydx": [to_json_floats(row) for row in slopes]
+    }
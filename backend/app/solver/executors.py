@@ -0,0 +1,338 @@
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app.solver import memory
+from app.utils import metrics
+
+# --------------------------------------------------
+# Execution units for solver jobs
+#
+# A job is identified by (problem_type, expression, window, trace) so it can be
+# shipped to another process. Every executor returns a Job whose `future`
+# resolves to (response, series) as returned by Solver.run_with_state.
+# --------------------------------------------------
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+def run_job(problem_type: str, expression: str, window, trace: bool = False):
+    from app.solver.registry import registry
+
+    return registry.get(problem_type).run_with_state(expression, window, trace)
+
+
+def run_tracked_job(problem_type: str, expression: str, window, trace: bool = False):
+    """
+    `run_job` for executors sharing the server process: applies the
+    memory policy afterwards and publishes the server's figures.
+    """
+    try:
+        return run_job(problem_type, expression, window, trace)
+    finally:
+        memory.report("memory.server", memory.policy.after_job())
+
+
+def _preload():
+    from app.solver.registry import registry
+
+    registry.load_builtin_solvers()
+
+
+class Job:
+    def __init__(self):
+        self.future = None
+        self.cancelled = False
+        self.worker = None
+        self._lock = threading.Lock()
+
+
+class ThreadExecutor:
+    """
+    Runs jobs on a thread pool. Queued jobs can be cancelled; running
+    ones cannot be interrupted and are left to finish.
+    """
+
+    name = "thread"
+
+    def __init__(self, workers: int, lane: str = "fast"):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"solver-{lane}")
+
+    def submit(self, problem_type: str, expression: str, window=None, trace: bool = False) -> Job:
+        job = Job()
+        job.future = self._pool.submit(run_tracked_job, problem_type, expression, window, trace)
+        return job
+
+    def wait_ready(self):
+        pass
+
+    def cancel(self, job: Job):
+        """
+        Returns "pending" if the job never started, "abandoned" if it is
+        still running, None if it already finished.
+        """
+        job.cancelled = True
+        if job.future.cancel():
+            return "pending"
+        return None if job.future.done() else "abandoned"
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _worker_main(conn):
+    # Ctrl-C is handled by the server process, which shuts workers down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Import SymPy and the solvers before taking work, then say so
+    _preload()
+    conn.send(memory.policy.stats())
+
+    while True:
+        try:
+            spec = conn.recv()
+        except (EOFError, OSError):
+            return
+        if spec is None:
+            return
+
+        try:
+            result = run_job(*spec)
+        except Exception as e:
+            result = e
+        conn.send((result, memory.policy.after_job()))
+
+
+class _Worker:
+    def __init__(self, ctx, slot: int):
+        self.slot = slot
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.killed = False
+        self.stats = None
+        self._ready_lock = threading.Lock()
+
+    def wait_ready(self) -> bool:
+        """
+        Blocks until the worker has finished importing; raises EOFError
+        if it died first. Returns True the first time it becomes ready.
+        """
+        with self._ready_lock:
+            if self.stats is not None:
+                return False
+            self.stats = self.conn.recv()
+            return True
+
+    def kill(self):
+        self.killed = True
+        self.process.kill()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.conn.close()
+
+
+class ProcessExecutor:
+    """
+    Runs each job in one of a fixed set of worker processes. Cancelling a
+    running job kills its process and starts a replacement, so abandoned
+    work stops consuming CPU immediately.
+
+    Workers report their memory after every job. One that has run
+    WORKER_MAX_JOBS jobs or grown past WORKER_MAX_RSS_MB is retired right
+    after returning its result (so no solve is interrupted) and replaced
+    by a fresh process, which is warmed up before it takes work.
+    """
+
+    name = "process"
+
+    def __init__(self, workers: int, lane: str = "fast"):
+        self.lane = lane
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._workers = set()
+        self._closed = False
+        for slot in range(workers):
+            self._idle.put(self._spawn(slot))
+
+        # One waiting thread per in-flight job; they only block on pipes
+        self._waiters = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"solver-{lane}-wait")
+
+    def submit(self, problem_type: str, expression: str, window=None, trace: bool = False) -> Job:
+        job = Job()
+        job.future = self._waiters.submit(self._run, job, (problem_type, expression, window, trace))
+        return job
+
+    def _report(self, worker: _Worker):
+        memory.report(f"memory.{self.lane}.worker{worker.slot}", worker.stats)
+
+    def _ready(self, worker: _Worker):
+        if worker.wait_ready():
+            self._report(worker)
+
+    def _run(self, job: Job, spec):
+        worker = self._idle.get()
+        with job._lock:
+            if job.cancelled:
+                self._idle.put(worker)
+                raise JobCancelled()
+            job.worker = worker
+
+        try:
+            self._ready(worker)
+            worker.conn.send(spec)
+            result, worker.stats = worker.conn.recv()
+        except (EOFError, OSError):
+            self._replace(worker)
+            if worker.killed:
+                raise JobCancelled()
+            raise WorkerCrashed("Solver worker exited unexpectedly")
+        finally:
+            with job._lock:
+                job.worker = None
+
+        self._report(worker)
+        if worker.killed:
+            # Cancelled right as it finished; the process is gone either way
+            self._replace(worker)
+        else:
+            reason = memory.recycle_reason(worker.stats)
+            if reason is not None:
+                metrics.increment(f"memory.recycled_{reason}")
+                worker.close()
+                self._replace(worker)
+            else:
+                self._idle.put(worker)
+
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def wait_ready(self):
+        for worker in list(self._workers):
+            try:
+                self._ready(worker)
+            except (EOFError, OSError):
+                # Replaced when a job next picks it up
+                pass
+
+    def _spawn(self, slot: int) -> _Worker:
+        worker = _Worker(self._ctx, slot)
+        self._workers.add(worker)
+        return worker
+
+    def _replace(self, worker: _Worker):
+        """
+        Reaps `worker` and brings up a replacement in the background; the
+        slot rejoins the idle queue once the new process has warmed up.
+        """
+        threading.Thread(target=self._respawn, args=(worker,), daemon=True).start()
+
+    def _respawn(self, worker: _Worker):
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.conn.close()
+        self._workers.discard(worker)
+
+        while not self._closed:
+            replacement = self._spawn(worker.slot)
+            try:
+                self._ready(replacement)
+            except (EOFError, OSError):
+                self._workers.discard(replacement)
+                time.sleep(1)
+                continue
+            if self._closed:
+                replacement.close()
+            else:
+                self._idle.put(replacement)
+            return
+
+    def cancel(self, job: Job):
+        """
+        Returns "pending" if the job never started, "killed" if its worker
+        process was terminated, None if it already finished.
+        """
+        with job._lock:
+            job.cancelled = True
+            if job.future.cancel():
+                return "pending"
+            if job.worker is not None:
+                job.worker.kill()
+                return "killed"
+        # Still waiting for a free worker; _run sees the flag and bails out
+        return None if job.future.done() else "pending"
+
+    def shutdown(self):
+        self._closed = True
+        self._waiters.shutdown(wait=False, cancel_futures=True)
+        idle = set()
+        while True:
+            try:
+                idle.add(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+        # Idle workers exit on their own; busy ones are abandoned mid-solve
+        for worker in list(self._workers):
+            if worker in idle:
+                worker.close()
+            else:
+                worker.kill()
+        for worker in list(self._workers):
+            worker.process.join(timeout=1)
+        self._workers.clear()
+
+
+class AsyncExecutor:
+    """
+    Runs jobs inline on the submitting thread, which for async routes is
+    the event loop itself. No parallelism and nothing to cancel; kept as
+    the single-threaded baseline for load tests.
+    """
+
+    name = "async"
+
+    def __init__(self, workers: int, lane: str = "fast"):
+        pass
+
+    def wait_ready(self):
+        pass
+
+    def submit(self, problem_type: str, expression: str, window=None, trace: bool = False) -> Job:
+        job = Job()
+        job.future = Future()
+        try:
+            job.future.set_result(run_tracked_job(problem_type, expression, window, trace))
+        except Exception as e:
+            job.future.set_exception(e)
+        return job
+
+    def cancel(self, job: Job):
+        job.cancelled = True
+        return None
+
+    def shutdown(self):
+        pass
+
+
+EXECUTORS = {
+    "thread": ThreadExecutor,
+    "process": ProcessExecutor,
+    "async": AsyncExecutor,
+}
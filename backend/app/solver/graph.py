@@ -0,0 +1,204 @@
+import math
+import threading
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+
+from app import config
+from app.solver.parsing import x
+
+
+def to_json_floats(values, precision=None):
+    """
+    Rounds an array to `precision` decimals and converts it to a list,
+    with NaN/inf replaced by None.
+    """
+    if precision is None:
+        precision = config.GRAPH_PRECISION
+
+    # Values too large to scale by 10**precision overflow to inf -> None
+    with np.errstate(over="ignore", invalid="ignore"):
+        values = np.round(np.asarray(values, dtype=float), precision)
+    return [v if v == v and abs(v) != np.inf else None for v in values.tolist()]
+
+
+@lru_cache(maxsize=256)
+def compile_function(sym_expr, var=x):
+    """
+    Lambdifies `sym_expr` into a NumPy callable (cached per expression).
+    """
+    return sp.lambdify(var, sym_expr, modules=["numpy"])
+
+
+def evaluate(sym_expr, var, xs):
+    """
+    Evaluates sym_expr at every point of `xs` in one vectorized call.
+    Undefined or non-real values come back as NaN.
+    """
+    try:
+        f = compile_function(sym_expr, var)
+        with np.errstate(all="ignore"):
+            ys = np.broadcast_to(np.asarray(f(xs)), xs.shape)
+    except Exception:
+        return np.full(xs.shape, np.nan)
+
+    if np.iscomplexobj(ys):
+        ys = np.where(ys.imag == 0, ys.real, np.nan)
+
+    try:
+        return ys.astype(float)
+    except (TypeError, ValueError):
+        return np.full(xs.shape, np.nan)
+
+
+def downsample(xs, ys, target):
+    """
+    Largest-Triangle-Three-Buckets downsampling to exactly `target` points.
+    Keeps the endpoints and, per bucket, the point that best preserves the
+    curve's peaks and troughs. Buckets that are entirely undefined keep a
+    NaN point so gaps survive.
+    """
+    n = len(xs)
+    if target >= n:
+        return xs, ys
+    if target <= 2:
+        keep = [0, n - 1][:max(target, 0)]
+        return xs[keep], ys[keep]
+
+    keep = [0]
+    every = (n - 2) / (target - 2)
+    a = 0
+
+    for i in range(target - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        bucket_x = xs[start:end]
+        bucket_y = ys[start:end]
+        finite = np.isfinite(bucket_y)
+
+        if not finite.any():
+            a = start
+            keep.append(a)
+            continue
+
+        next_y = ys[next_start:next_end]
+        next_finite = np.isfinite(next_y)
+        if next_finite.any():
+            avg_x = xs[next_start:next_end][next_finite].mean()
+            avg_y = next_y[next_finite].mean()
+        else:
+            avg_x, avg_y = xs[next_start:next_end].mean(), ys[a]
+
+        if np.isfinite(ys[a]) and np.isfinite(avg_y):
+            area = np.abs(
+                (xs[a] - avg_x) * (bucket_y - ys[a])
+                - (xs[a] - bucket_x) * (avg_y - ys[a])
+            )
+        else:
+            # No usable anchor: keep the most extreme point in the bucket
+            area = np.abs(bucket_y - np.nanmean(bucket_y))
+
+        area = np.where(finite, area, -1.0)
+        a = start + int(np.argmax(area))
+        keep.append(a)
+
+    keep.append(n - 1)
+    return xs[keep], ys[keep]
+
+
+def generate_graph_data(sym_expr, var=x, start=-10, end=10, num=None):
+    """
+    Samples y = sym_expr(var) on [start, end] and returns `num` points.
+    At least GRAPH_POINTS are sampled; smaller requests are downsampled.
+    Points where the function is undefined or not real come back as None.
+    """
+    if num is None:
+        num = config.GRAPH_POINTS
+
+    xs = np.linspace(start, end, max(num, config.GRAPH_POINTS))
+    ys = evaluate(sym_expr, var, xs)
+    xs, ys = downsample(xs, ys, num)
+
+    return {
+        "x": to_json_floats(xs),
+        "y": to_json_floats(ys)
+    }
+
+
+class GraphWindowCache:
+    """
+    Samples one function on a grid aligned to multiples of the step size,
+    returning `num` columns from `start` to `end` and remembering every
+    column already evaluated. Panning only evaluates the columns that
+    scrolled into view; zooming back reuses the old grid. The first and
+    last columns are the window edges themselves, evaluated on each call,
+    so they can sit closer to their neighbours than the step.
+    """
+
+    def __init__(self, sym_expr, var=x, max_points=None):
+        self.sym_expr = sym_expr
+        self.var = var
+        self.max_points = max_points or config.GRAPH_CACHE_POINTS
+        self._grids = {}
+        self._lock = threading.Lock()
+
+    def sample(self, start, end, num):
+        with self._lock:
+            return self._sample(start, end, num)
+
+    def _sample(self, start, end, num):
+        if num < 3:
+            # Too few columns to both align and cover: sample the edges
+            xs = np.array([start, end], dtype=float)
+            return {
+                "x": to_json_floats(xs),
+                "y": to_json_floats(evaluate(self.sym_expr, self.var, xs))
+            }
+
+        # `num` aligned columns spaced span/(num-2) apart always reach from
+        # at or below `start` to at or above `end`, wherever the window
+        # sits; only the outer two can fall outside, and they are replaced
+        # by the edges below
+        step = (end - start) / (num - 2)
+        key = round(step, 12)
+        grid = self._grids.setdefault(key, {})
+
+        first = math.floor(start / step + 1e-9)
+        ks = np.arange(first, first + num)
+        missing = [k for k in ks.tolist() if k not in grid]
+
+        if missing:
+            ys = evaluate(self.sym_expr, self.var, np.array(missing, dtype=float) * step)
+            grid.update(zip(missing, ys.tolist()))
+
+        xs = ks * step
+        ys = np.array([grid[k] for k in ks.tolist()], dtype=float)
+        edges = [0, num - 1]
+        xs[0], xs[-1] = start, end
+        if xs[-2] >= end - step * 1e-9:
+            # Window aligned to the grid: the last interior column is `end`
+            # already, so split the final step instead of repeating it
+            edges.append(num - 2)
+            xs[-2] = end - step / 2
+        ys[edges] = evaluate(self.sym_expr, self.var, xs[edges])
+        self._evict(key)
+
+        return {
+            "x": to_json_floats(xs),
+            "y": to_json_floats(ys)
+        }
+
+    def _evict(self, current):
+        # Drop other zoom levels first, then start the current grid over
+        total = sum(len(g) for g in self._grids.values())
+        for key in list(self._grids):
+            if total <= self.max_points:
+                return
+            if key != current:
+                total -= len(self._grids.pop(key))
+        if total > self.max_points:
+            self._grids[current] = {}
@@ -1,111 +1,92 @@
+import re
+
 import sympy as sp
-from sympy.parsing.sympy_parser import parse_expr
-import numpy as np
 
-x = sp.symbols("x")
+from app.solver.complexity import estimate
+from app.solver.parsing import parse
+from app.solver.registry import Solver, register
+from app.solver.trace import trace_limit
 
-def generate_graph_data(expr, var, start=-5, end=5, num=400):
-    xs = np.linspace(start, end, num)
-    ys = []
+# lim x->0 sin(x)/x, limit x→oo 1/x, lim x to -2 (x^2-4)/(x+2)
+LIMIT_PATTERN = re.compile(
+    r"^\s*lim(?:it)?\s*([a-z])\s*(?:->|→|\bto\b)\s*"
+    r"([-+]?(?:\d*\.?\d+|oo|inf(?:inity)?))\s*(.*)$"
+)
 
-    f = sp.lambdify(var, expr, modules=["numpy"])
 
-    for val in xs:
-        try:
-            y = f(val)
-            if y is None or np.isnan(y) or np.isinf(y):
-                ys.append(None)
-            else:
-                ys.append(float(y))
-        except Exception:
-            ys.append(None)
+@register("limits")
+class LimitsSolver(Solver):
+    problem_type = "limits"
 
-    series = []
-    for x_val, y_val in zip(xs, ys):
-        if y_val is not None:
-            series.append({
-                "x": float(x_val),
-                "y": float(y_val)
-            })
+    def prepare(self, expression: str) -> dict:
+        # Normalize arrows and spacing
+        cleaned = expression.lower().replace("^", "**").strip()
 
-    return {
-        "series": series
-    }
+        # Expect something like: lim x->0 sin(x)/x
+        m = LIMIT_PATTERN.match(cleaned)
+        if not m:
+            raise ValueError("Invalid limit format. Use: lim x->a f(x)")
 
+        var_name, point, expr_str = m.groups()
+        point = re.sub(r"inf(inity)?", "oo", point)
 
-def solve_limits(expression: str):
-    try:
-        # Normalize arrows and spacing
-        cleaned = (
-            expression
-            .lower()
-            .replace("→", "->")
-            .replace("to", "->")
-            .replace("limit", "")
-            .strip()
-        )
-
-        # Expect something like: x->0 sin(x)/x
-        if "->" not in cleaned:
-            raise ValueError("Invalid limit format. Use: limit x->a f(x)")
-
-        left, right = cleaned.split("->", 1)
-
-        # variable (usually x)
-        var_name = left.strip()
-        var = sp.symbols(var_name)
-
-        # split point and expression
-        import re
-        m = re.match(r"\s*([-+]?\d*\.?\d+)\s*(.*)", right.strip())
-        if not m:
-            raise ValueError("Could not parse limit value.")
-
-        limit_at = float(m.group(1))
-        expr_str = m.group(2)
-
-        # Parse expression safely
-        expr = parse_expr(
-            expr_str,
-            local_dict={
-                var_name: var,
-                "sin": sp.sin,
-                "cos": sp.cos,
-                "tan": sp.tan,
-                "exp": sp.exp,
-                "log": sp.log
-            },
-            evaluate=True
-        )
+        return {
+            "expression": expression,
+            "var": sp.Symbol(var_name),
+            "point": sp.sympify(point),
+            "sym_expr": parse(expr_str)
+        }
+
+    def graph_exprs(self, prepared: dict) -> dict:
+        return {"function": (prepared["sym_expr"], prepared["var"])}
+
+    def default_window(self, prepared: dict):
+        # Center the graph on the limit point (fixed range for limits at infinity)
+        point = prepared["point"]
+        if point.is_finite:
+            return (float(point) - 5, float(point) + 5)
+        return (-5.0, 5.0)
+
+    def complexity(self, prepared: dict):
+        return estimate(prepared["sym_expr"], "limit")
+
+    def trace(self, prepared: dict, result: dict):
+        return trace_limit(prepared["sym_expr"], prepared["var"], prepared["point"])
+
+    def solve(self, prepared: dict) -> dict:
+        var = prepared["var"]
+        limit_at = prepared["point"]
+        expr = prepared["sym_expr"]
 
         # Compute limit
         result = sp.limit(expr, var, limit_at)
 
-        # Always generate graph data for the function
-        graph = generate_graph_data(expr, var, start=-5, end=5)
-
         return {
             "problem_type": "limits",
-            "original_expression": expression,
+            "original_expression": prepared["expression"],
             "solution": str(result),
             "steps": [
                 "Identify the limit expression",
                 f"Evaluate behavior as {var} → {limit_at}",
                 "Apply known limit rules"
             ],
-            "latex": sp.latex(result),
-            "graph": graph
+            "latex": sp.latex(result)
         }
 
-    except Exception as e:
+    def error(self, expression: str, exc: Exception) -> dict:
         # IMPORTANT: still return graph key so frontend can render
         return {
             "problem_type": "limits",
             "original_expression": expression,
             "solution": "Error",
-            "steps": [str(e)],
+            "steps": [str(exc)],
             "latex": "",
             "graph": {
-                "series": []
+                "x": [],
+                "y": []
             }
-        }
\ No newline at end of file
+        }
+
+
+def solve_limits(expression: str):
+    return LimitsSolver().run(expression)
@@ -0,0 +1,123 @@
+import gc
+import os
+import sys
+import threading
+
+from app import config
+from app.utils import metrics
+
+MB = 1024 * 1024
+
+# --------------------------------------------------
+# Memory governance for processes that run solver jobs
+#
+# SymPy memoizes heavily (sympy.core.cache, sized per function by the
+# SYMPY_CACHE_SIZE environment variable, which SymPy reads at import) and
+# our own parse/compile caches hold SymPy objects too. A process that runs
+# solver jobs calls `policy.after_job()` after each one; it clears those
+# caches on a schedule or when RSS crosses a soft limit, and reports the
+# figures the executor uses to decide when to recycle a worker.
+# --------------------------------------------------
+
+
+def rss_bytes() -> int:
+    """
+    Current resident set size of this process.
+    Falls back to the peak RSS where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+        except ImportError:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, everything else KiB
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def sympy_cache_entries() -> int:
+    from sympy.core.cache import CACHE
+
+    return sum(cached.cache_info().currsize for cached in CACHE)
+
+
+def clear_caches():
+    """
+    Drops SymPy's internal cache and our own memoized parses, compiled
+    functions and derivation traces, then collects the cycles they leave behind.
+    """
+    from sympy.core.cache import clear_cache
+
+    from app.solver.contour import compile_function_2d
+    from app.solver.graph import compile_function
+    from app.solver.parsing import _parse
+    from app.solver.trace import clear_traces
+
+    clear_cache()
+    _parse.cache_clear()
+    compile_function.cache_clear()
+    compile_function_2d.cache_clear()
+    clear_traces()
+    gc.collect()
+
+
+class MemoryPolicy:
+    """
+    Per-process cache clearing. Clears every `clear_every` jobs (0 = never)
+    and whenever RSS exceeds `clear_rss_mb`.
+    """
+
+    def __init__(self, clear_every: int, clear_rss_mb: float):
+        self.clear_every = clear_every
+        self.clear_rss = clear_rss_mb * MB
+        self.jobs = 0
+        self.clears = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "jobs": self.jobs,
+            "clears": self.clears,
+            "rss_mb": round(rss_bytes() / MB, 1),
+            "sympy_cache_entries": sympy_cache_entries()
+        }
+
+    def after_job(self) -> dict:
+        with self._lock:
+            self.jobs += 1
+            scheduled = self.clear_every and self.jobs % self.clear_every == 0
+            if scheduled or rss_bytes() > self.clear_rss:
+                clear_caches()
+                self.clears += 1
+            return self.stats()
+
+
+policy = MemoryPolicy(
+    clear_every=config.MEMORY_CLEAR_CACHE_JOBS,
+    clear_rss_mb=config.MEMORY_CLEAR_CACHE_RSS_MB
+)
+
+
+def recycle_reason(stats: dict):
+    """
+    Why a worker reporting `stats` should be replaced, or None.
+    """
+    if config.WORKER_MAX_JOBS and stats["jobs"] >= config.WORKER_MAX_JOBS:
+        return "jobs"
+    if config.WORKER_MAX_RSS_MB and stats["rss_mb"] > config.WORKER_MAX_RSS_MB:
+        return "rss"
+    return None
+
+
+def report(prefix: str, stats: dict):
+    """
+    Publishes a process's memory figures as gauges under `prefix`.
+    """
+    metrics.set_gauge(f"{prefix}.rss_mb", stats["rss_mb"])
+    metrics.set_gauge(f"{prefix}.jobs", stats["jobs"])
+    metrics.set_gauge(f"{prefix}.cache_clears", stats["clears"])
+    metrics.set_gauge(f"{prefix}.sympy_cache_entries", stats["sympy_cache_entries"])
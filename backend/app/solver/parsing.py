@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+from sympy import symbols
+from sympy.core.parameters import global_parameters
+from sympy.parsing.sympy_parser import (
+    parse_expr,
+    standard_transformations,
+    implicit_multiplication_application,
+    convert_xor
+)
+
+# Define supported symbols (extend later if needed)
+x, y, z = symbols("x y z")
+
+# Allow implicit multiplication: 2x, 3xy, 4(x+1)
+TRANSFORMATIONS = standard_transformations + (
+    implicit_multiplication_application,
+    convert_xor,
+)
+
+
+def normalize(expression: str) -> str:
+    """
+    Whitespace-insensitive form of an expression, used as a lookup key.
+    Case is kept: symbols are case-sensitive, so `X - 1 = 0` is solved for X.
+    """
+    return "".join(expression.split())
+
+
+def parse(text: str):
+    """
+    Parses `text` into a SymPy expression.
+    SymPy expressions are immutable, so parses are shared between requests.
+
+    Inside `sympy.evaluate(False)` the expression is kept as typed (no
+    arithmetic is carried out), which is how complexity estimates parse
+    input safely; those parses are cached separately.
+    """
+    return _parse(text, global_parameters.evaluate)
+
+
+@lru_cache(maxsize=1024)
+def _parse(text: str, evaluate: bool):
+    return parse_expr(
+        text,
+        transformations=TRANSFORMATIONS,
+        local_dict={"x": x, "y": y, "z": z},
+        evaluate=evaluate
+    )
@@ -0,0 +1,516 @@
+import asyncio
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from tokenize import TokenError
+
+from sympy import evaluate
+
+from app import config
+from app.solver.executors import EXECUTORS
+from app.solver.graph import generate_graph_data
+from app.utils import metrics
+
+# Modules whose solvers register themselves on import
+BUILTIN_SOLVERS = (
+    "app.solver.algebra",
+    "app.solver.calculus",
+    "app.solver.limits",
+)
+
+_SOLVERS = {}
+
+# What a malformed expression raises while parsing; the solver reports
+# these itself, cheaply, so they don't need sizing first
+PARSE_ERRORS = (SyntaxError, TokenError, ValueError, TypeError, NameError)
+
+
+class SolverTimeout(Exception):
+    pass
+
+
+class SolverCancelled(Exception):
+    pass
+
+
+class SolverRejected(Exception):
+    pass
+
+
+class SolverFailed(Exception):
+    pass
+
+
+class Solver:
+    """
+    Base class for problem solvers.
+
+    `prepare` turns the raw expression into parsed SymPy objects,
+    `solve` does the actual math and builds the response dict.
+    """
+
+    problem_type = "unknown"
+
+    def prepare(self, expression: str) -> dict:
+        raise NotImplementedError
+
+    def solve(self, prepared: dict) -> dict:
+        raise NotImplementedError
+
+    def error(self, expression: str, exc: Exception) -> dict:
+        return {
+            "problem_type": self.problem_type,
+            "original_expression": expression,
+            "solution": f"Could not solve the expression: {str(exc)}",
+            "steps": [],
+            "latex": ""
+        }
+
+    def graph_exprs(self, prepared: dict) -> dict:
+        """
+        Maps series names to the (sym_expr, var) pairs this problem plots.
+        """
+        return {}
+
+    def default_window(self, prepared: dict):
+        return (-10.0, 10.0)
+
+    def trace(self, prepared: dict, result: dict):
+        """
+        Steps recording the rules actually applied to reach `result`, or
+        None to keep the solver's generic steps. Only called for requests
+        that ask for a trace.
+        """
+        return None
+
+    def complexity(self, prepared: dict):
+        """
+        Pre-solve cost estimate (see app.solver.complexity.estimate), or
+        None if this problem can't be estimated. Called on an unevaluated
+        parse, so it must not do any math on the expressions.
+        """
+        return None
+
+    def graph(self, prepared: dict, window=None):
+        """
+        Samples every series over `window` = (x_min, x_max, points), where
+        any part may be None to use the solver's default. A single series
+        is returned flat as {"x", "y"}, several are keyed by name.
+        """
+        exprs = self.graph_exprs(prepared)
+        if not exprs:
+            return None
+
+        x_min, x_max, points = self.resolve_window(prepared, window)
+        graph = {
+            name: generate_graph_data(sym_expr, var, start=x_min, end=x_max, num=points)
+            for name, (sym_expr, var) in exprs.items()
+        }
+        if len(graph) == 1:
+            return next(iter(graph.values()))
+        return graph
+
+    def resolve_window(self, prepared: dict, window=None):
+        """
+        Fills the None parts of (x_min, x_max, points) from the default window.
+        """
+        x_min, x_max, points = window or (None, None, None)
+        default_min, default_max = self.default_window(prepared)
+
+        # Only one bound given: keep the default width next to it
+        width = default_max - default_min
+        if x_min is None and x_max is None:
+            x_min, x_max = default_min, default_max
+        elif x_max is None:
+            x_max = default_max if default_max > x_min else x_min + width
+        elif x_min is None:
+            x_min = default_min if default_min < x_max else x_max - width
+
+        return x_min, x_max, points
+
+    def run_with_state(self, expression: str, window=None, trace: bool = False):
+        """
+        Returns (response, series), where series is `graph_exprs` for the
+        solved problem ({} if solving failed). The series are computed in
+        the same execution unit as the solve, so live sessions can plot
+        them without re-deriving anything in the server process.
+        """
+        try:
+            prepared = self.prepare(expression)
+            result = self.solve(prepared)
+            if trace:
+                self._apply_trace(prepared, result)
+            graph = self.graph(prepared, window)
+            if graph is not None:
+                result["graph"] = graph
+        except Exception as e:
+            return self.error(expression, e), {}
+
+        try:
+            series = self.graph_exprs(prepared)
+        except Exception:
+            series = {}
+        return result, series
+
+    def _apply_trace(self, prepared: dict, result: dict):
+        # The outcome travels with the result (jobs may run in another
+        # process) and is counted by the registry
+        try:
+            steps = self.trace(prepared, result)
+        except Exception:
+            # A rule the tracer can't follow shouldn't cost the answer
+            result["traced"] = False
+            return
+        if steps:
+            result["steps"] = steps
+            result["traced"] = True
+
+    def run(self, expression: str, window=None, trace: bool = False) -> dict:
+        return self.run_with_state(expression, window, trace)[0]
+
+
+def register(*problem_types):
+    """
+    Class decorator mapping one or more problem types to a solver.
+    """
+    def decorator(cls):
+        for problem_type in problem_types:
+            _SOLVERS[problem_type] = cls
+        return cls
+
+    return decorator
+
+
+def payload_size(value) -> int:
+    """
+    Number of scalar values in a nested dict/list payload such as a graph.
+    """
+    if isinstance(value, dict):
+        return sum(payload_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        if value and not isinstance(value[0], (dict, list, tuple)):
+            return len(value)
+        return sum(payload_size(v) for v in value)
+    return 1
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of solver responses, bounded by entry count and,
+    if `max_weight` is set, by the total `weigh(value)` of its entries.
+    A value heavier than `max_weight` on its own is not cached.
+    """
+
+    def __init__(self, maxsize: int, max_weight: int = 0, weigh=None):
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self.weigh = weigh
+        self.weight = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        weight = self.weigh(value) if self.max_weight and self.weigh else 0
+        if self.max_weight and weight > self.max_weight:
+            return
+        with self._lock:
+            if key in self._data:
+                self.weight -= self._data.pop(key)[1]
+            self._data[key] = (value, weight)
+            self.weight += weight
+            while len(self._data) > self.maxsize or (self.max_weight and self.weight > self.max_weight):
+                self.weight -= self._data.popitem(last=False)[1][1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+
+
+class SolverRegistry:
+    """
+    Dispatches expressions to registered solvers.
+    Caching, scheduling, timeouts, cancellation and metrics are applied
+    here, once for every solver.
+
+    Each uncached problem gets a complexity estimate first: cheap ones run
+    in the "fast" lane, those at or above `heavy_cost` in the smaller
+    "heavy" lane with its own timeout, and anything above `max_cost` (or
+    longer than `max_length` characters) is rejected without being solved.
+    """
+
+    def __init__(
+        self,
+        cache_size: int,
+        timeout: float,
+        workers: int,
+        execution: str = "thread",
+        heavy_timeout: float = None,
+        heavy_workers: int = 1,
+        heavy_cost: float = float("inf"),
+        max_cost: float = float("inf"),
+        max_length: int = 0,
+        cache_max_values: int = 0
+    ):
+        # Weighed by graph size: one implicit curve can hold as many values
+        # as hundreds of ordinary responses
+        self.cache = ResultCache(
+            cache_size,
+            max_weight=cache_max_values,
+            weigh=lambda entry: payload_size(entry[0].get("graph"))
+        )
+        self.execution = execution
+        self.timeouts = {"fast": timeout, "heavy": heavy_timeout or timeout}
+        self.workers = {"fast": workers, "heavy": heavy_workers}
+        self.heavy_cost = heavy_cost
+        self.max_cost = max_cost
+        self.max_length = max_length
+        self._instances = {}
+        self._executors = {}
+        self._executor_lock = threading.Lock()
+        self._loaded = False
+
+    def load_builtin_solvers(self):
+        if not self._loaded:
+            for module in BUILTIN_SOLVERS:
+                importlib.import_module(module)
+            self._loaded = True
+
+    def executor(self, lane: str = "fast"):
+        # Created on first use so worker processes importing this module
+        # never start executors of their own
+        executor = self._executors.get(lane)
+        if executor is None:
+            with self._executor_lock:
+                executor = self._executors.get(lane)
+                if executor is None:
+                    executor = EXECUTORS[self.execution](self.workers[lane], lane=lane)
+                    self._executors[lane] = executor
+        return executor
+
+    def start(self):
+        """
+        Loads the solvers and starts the fast lane's workers, returning
+        once they are ready to take jobs. The heavy lane starts with its
+        first job, so servers that never see one don't pay for its workers.
+        """
+        self.load_builtin_solvers()
+        self.executor("fast").wait_ready()
+
+    def shutdown(self):
+        with self._executor_lock:
+            for executor in self._executors.values():
+                executor.shutdown()
+            self._executors.clear()
+
+    def get(self, problem_type: str):
+        self.load_builtin_solvers()
+        cls = _SOLVERS.get(problem_type)
+        if cls is None:
+            return None
+        if cls not in self._instances:
+            self._instances[cls] = cls()
+        return self._instances[cls]
+
+    def _cached(self, problem_type: str, expression: str, window, trace: bool):
+        """
+        Returns (solver, key, immediate) where immediate is a
+        (response, series) answer (cache hit or unsupported type) or None
+        if work is needed.
+        """
+        solver = self.get(problem_type)
+        if solver is None:
+            return None, None, ({
+                "problem_type": problem_type,
+                "original_expression": expression,
+                "solution": "Solver not implemented yet",
+                "steps": [],
+                "latex": ""
+            }, {})
+
+        key = (problem_type, expression, window, trace)
+        cached = self.cache.get(key)
+        if cached is not None:
+            metrics.increment("solver.cache_hits")
+            result, series = cached
+            return solver, key, (dict(result), series)
+
+        metrics.increment("solver.cache_misses")
+        return solver, key, None
+
+    def estimate(self, solver: Solver, expression: str):
+        """
+        Complexity estimate for `expression`, or None if it can't be made
+        (unparseable input is left for the solver to report). Parsing runs
+        with evaluation off, so this is cheap even for inputs like 9^9^9^9.
+        Failures other than parse errors, and any failure of the estimator
+        itself, propagate.
+        """
+        with evaluate(False):
+            try:
+                prepared = solver.prepare(expression)
+            except PARSE_ERRORS:
+                return None
+            return solver.complexity(prepared)
+
+    def schedule(self, problem_type: str, solver: Solver, expression: str):
+        """
+        Returns (lane, estimate); raises SolverRejected above `max_cost`,
+        above `max_length`, or when the input is nested too deeply to size.
+        """
+        if self.max_length and len(expression) > self.max_length:
+            metrics.increment("scheduler.rejected")
+            raise SolverRejected(
+                f"Expression is too long to solve ({len(expression)} characters, limit {self.max_length})"
+            )
+
+        try:
+            estimate = self.estimate(solver, expression)
+        except RecursionError:
+            # Even the unevaluated parse overflowed; solving would too
+            metrics.increment("scheduler.rejected")
+            raise SolverRejected("Expression is nested too deeply to solve")
+        except Exception:
+            # Parsed but couldn't be sized: don't let it hold a fast worker
+            metrics.increment("scheduler.unestimated")
+            metrics.increment("scheduler.heavy")
+            return "heavy", None
+
+        if estimate is None:
+            metrics.increment("scheduler.unestimated")
+            return "fast", None
+
+        cost = estimate["cost"]
+        metrics.record(f"complexity.{problem_type}", cost)
+        if cost > self.max_cost:
+            metrics.increment("scheduler.rejected")
+            raise SolverRejected(
+                f"Expression is too complex to solve (estimated cost {cost:g}, limit {self.max_cost:g})"
+            )
+
+        lane = "heavy" if cost >= self.heavy_cost else "fast"
+        metrics.increment(f"scheduler.{lane}")
+        return lane, estimate
+
+    def _submit(self, problem_type: str, solver: Solver, expression: str, window, trace: bool):
+        lane, estimate = self.schedule(problem_type, solver, expression)
+        job = self.executor(lane).submit(problem_type, expression, window, trace)
+        return job, lane, estimate
+
+    def _observe(self, problem_type: str, lane: str, estimate, seconds: float):
+        metrics.observe(f"solver.{problem_type}", seconds)
+        metrics.observe(f"lane.{lane}", seconds)
+        if estimate is not None:
+            # Solve time per cost bucket, for tuning the lane thresholds
+            metrics.observe(f"complexity.cost{metrics.bucket(estimate['cost'])}", seconds)
+
+    def _cancel(self, job, lane: str, problem_type: str, reason: str):
+        outcome = self.executor(lane).cancel(job)
+        # Swallow the job's own cancellation error; nobody is waiting for it
+        job.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        metrics.increment(f"solver.{problem_type}.{reason}")
+        if outcome is not None:
+            metrics.increment(f"solver.jobs_{outcome}")
+
+    def _timeout_error(self, lane: str):
+        return SolverTimeout(
+            f"Solving took longer than {self.timeouts[lane]:g} seconds"
+        )
+
+    def _finish(self, problem_type: str, key, result, series):
+        metrics.increment(f"solver.{problem_type}.solved")
+        if "verified" in result:
+            outcome = {True: "verified", False: "mismatch", None: "unchecked"}[result["verified"]]
+            metrics.increment(f"verify.{outcome}")
+        if "traced" in result:
+            metrics.increment("trace.traced" if result["traced"] else "trace.failed")
+        self.cache.put(key, (result, series))
+        return dict(result)
+
+    async def solve_with_state_async(
+        self, problem_type: str, expression: str, window=None, trace: bool = False, disconnected=None
+    ):
+        """
+        Solves `expression` (or answers it from the cache) and returns
+        (response, solver, series); see `Solver.run_with_state`.
+
+        The job is cancelled (its worker process killed in process mode)
+        when it times out, when the awaiting task is cancelled, or when the
+        optional `disconnected` awaitable completes first.
+        """
+        solver, key, immediate = self._cached(problem_type, expression, window, trace)
+        if immediate is not None:
+            if asyncio.iscoroutine(disconnected):
+                disconnected.close()
+            response, series = immediate
+            return response, solver, series
+
+        start = time.perf_counter()
+        try:
+            job, lane, estimate = self._submit(problem_type, solver, expression, window, trace)
+        except SolverRejected:
+            if asyncio.iscoroutine(disconnected):
+                disconnected.close()
+            raise
+
+        waiter = asyncio.wrap_future(job.future)
+        watchers = {waiter}
+        disconnect = None
+        if disconnected is not None:
+            disconnect = asyncio.ensure_future(disconnected)
+            watchers.add(disconnect)
+
+        try:
+            done, _ = await asyncio.wait(watchers, timeout=self.timeouts[lane], return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            waiter.cancel()
+            self._cancel(job, lane, problem_type, "cancelled")
+            raise
+        finally:
+            if disconnect is not None:
+                disconnect.cancel()
+            self._observe(problem_type, lane, estimate, time.perf_counter() - start)
+
+        if waiter in done:
+            try:
+                result, series = waiter.result()
+            except Exception as e:
+                # Solver errors come back as responses; this is the executor
+                # itself failing (e.g. a worker killed by the OOM killer)
+                metrics.increment(f"solver.{problem_type}.failed")
+                raise SolverFailed(f"Solver unavailable: {e}") from e
+            return self._finish(problem_type, key, result, series), solver, series
+
+        # Detach from the job so its cancellation error isn't reported as unretrieved
+        waiter.cancel()
+
+        if disconnect is not None and disconnect in done:
+            self._cancel(job, lane, problem_type, "cancelled")
+            raise SolverCancelled("Client disconnected")
+
+        self._cancel(job, lane, problem_type, "timeouts")
+        raise self._timeout_error(lane)
+
+
+registry = SolverRegistry(
+    cache_size=config.SOLVER_CACHE_SIZE,
+    timeout=config.SOLVER_TIMEOUT_SECONDS,
+    workers=config.SOLVER_WORKERS,
+    execution=config.SOLVER_EXECUTION,
+    heavy_timeout=config.SOLVER_HEAVY_TIMEOUT_SECONDS,
+    heavy_workers=config.SOLVER_HEAVY_WORKERS,
+    heavy_cost=config.COMPLEXITY_HEAVY_COST,
+    max_cost=config.COMPLEXITY_MAX_COST,
+    max_length=config.MAX_EXPRESSION_LENGTH,
+    cache_max_values=config.SOLVER_CACHE_MAX_VALUES
+)
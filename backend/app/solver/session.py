@@ -0,0 +1,101 @@
+import threading
+
+from app import config
+from app.solver.graph import GraphWindowCache
+from app.solver.parsing import normalize
+from app.solver.registry import registry
+from app.utils.detector import detect_problem_type
+
+
+class SolveSession:
+    """
+    Per-connection state for live solving.
+
+    Keeps the last solved expression, the functions it plots (returned
+    by the solver job, so nothing is re-derived here) and one
+    GraphWindowCache per series, so re-sends of the same input are free
+    and pan/zoom only samples newly visible columns.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.expression = None
+        self.result = None
+        self.exprs = {}
+        self.window = None
+        self.series = {}
+        self._stale = False
+        self._lock = threading.Lock()
+
+    async def update_expression(self, expression: str, trace: bool = False):
+        """
+        Solves `expression` unless it normalizes to the current one (and
+        the trace setting is unchanged).
+        Returns the response dict, or None if nothing changed. Cancelling
+        the calling task cancels the solver job as well.
+        """
+        key = (normalize(expression), trace)
+        if key == self.key:
+            return None
+
+        problem_type = detect_problem_type(expression)
+        result, _, exprs = await registry.solve_with_state_async(problem_type, expression, trace=trace)
+
+        with self._lock:
+            self.key = key
+            self.expression = expression
+            self.result = result
+            self.exprs = exprs
+            self._stale = True
+        return result
+
+    def _refresh_series(self):
+        """
+        Rebuilds the per-series caches after an expression change. Runs
+        lazily on the first graph request, so typing without panning never
+        pays for it.
+        """
+        self._stale = False
+
+        series = {}
+        for name, (sym_expr, var) in self.exprs.items():
+            previous = self.series.get(name)
+            if previous is not None and previous.sym_expr == sym_expr and previous.var == var:
+                # Same function after an edit (e.g. extra spaces or parens): keep samples
+                series[name] = previous
+            else:
+                series[name] = GraphWindowCache(sym_expr, var)
+        self.series = series
+
+    def set_window(self, x_min: float, x_max: float, points: int):
+        x_min, x_max = float(x_min), float(x_max)
+        # Same bounds as SolveRequest; the comparison also rejects NaN and ±inf
+        limit = config.GRAPH_MAX_ABS_X
+        if not (abs(x_min) <= limit and abs(x_max) <= limit):
+            raise ValueError(f"x_min and x_max must be finite and within ±{limit:g}")
+        if not x_max > x_min:
+            raise ValueError("x_max must be greater than x_min")
+        points = max(2, min(int(points), config.GRAPH_MAX_POINTS))
+        self.window = (x_min, x_max, points)
+
+    def graph(self):
+        """
+        Samples every series over the current window.
+        """
+        with self._lock:
+            if self._stale:
+                self._refresh_series()
+            window = self.window
+            series = self.series
+
+        if window is None or not series:
+            return None
+
+        x_min, x_max, points = window
+        return {
+            "window": {"x_min": x_min, "x_max": x_max, "points": points},
+            "series": {
+                name: cache.sample(x_min, x_max, points)
+                for name, cache in series.items()
+            }
+        }
@@ -0,0 +1,302 @@
+from functools import lru_cache
+from typing import Any, NamedTuple, Tuple
+
+import sympy as sp
+from sympy.integrals.manualintegrate import integral_steps
+
+# --------------------------------------------------
+# Derivation tracer
+#
+# Records the rules that actually produce a derivative, antiderivative or
+# limit and renders them as `steps` strings. Traces are memoized per
+# subexpression (derivatives) or per problem (integrals, limits), so a
+# subterm shared across requests, or repeated inside one expression, is
+# derived once. Only requests that ask for a trace pay for any of this.
+# --------------------------------------------------
+
+# L'Hôpital applications before handing the rest to sympy.limit
+MAX_LHOPITAL = 4
+
+
+class Step(NamedTuple):
+    expr: Any
+    rule: str
+    detail: str
+    result: Any
+    substeps: Tuple["Step", ...] = ()
+
+
+# --------------------------------------------------
+# Derivatives
+# --------------------------------------------------
+@lru_cache(maxsize=4096)
+def derivative_step(expr, var) -> Step:
+    """
+    Differentiates `expr` rule by rule; `result` is the unsimplified derivative.
+    """
+    if not expr.has(var):
+        return Step(expr, "constant", "", sp.S.Zero)
+
+    if expr == var:
+        return Step(expr, "identity", "", sp.S.One)
+
+    if expr.is_Add:
+        subs = tuple(derivative_step(term, var) for term in expr.args)
+        return Step(expr, "sum rule", "differentiate term by term", sp.Add(*[s.result for s in subs]), subs)
+
+    if expr.is_Mul:
+        coefficient, rest = expr.as_independent(var, as_Add=False)
+        if coefficient != 1:
+            sub = derivative_step(rest, var)
+            return Step(expr, "constant multiple", f"factor out {coefficient}", coefficient * sub.result, (sub,))
+
+        numerator, denominator = sp.fraction(expr)
+        if denominator != 1 and denominator.has(var):
+            top, bottom = derivative_step(numerator, var), derivative_step(denominator, var)
+            result = (top.result * denominator - numerator * bottom.result) / denominator ** 2
+            return Step(
+                expr, "quotient rule", f"(f'g - fg')/g² with f = {numerator}, g = {denominator}",
+                result, (top, bottom)
+            )
+
+        factors = expr.args
+        subs = tuple(derivative_step(factor, var) for factor in factors)
+        result = sp.Add(*[
+            sp.Mul(*[subs[i].result if i == j else factor for i, factor in enumerate(factors)])
+            for j in range(len(factors))
+        ])
+        names = " · ".join(str(factor) for factor in factors)
+        return Step(expr, "product rule", f"(fg)' = f'g + fg' over {names}", result, subs)
+
+    if expr.is_Pow:
+        base, exponent = expr.as_base_exp()
+
+        if not exponent.has(var):
+            outer = exponent * base ** (exponent - 1)
+            if base == var:
+                return Step(expr, "power rule", f"d/d{var} {var}ⁿ = n·{var}ⁿ⁻¹ with n = {exponent}", outer)
+            inner = derivative_step(base, var)
+            return Step(expr, "chain rule", f"outer u^{exponent}, inner u = {base}", outer * inner.result, (inner,))
+
+        if not base.has(var):
+            outer = expr * sp.log(base)
+            if exponent == var:
+                return Step(expr, "exponential rule", f"d/d{var} a^{var} = a^{var}·ln(a) with a = {base}", outer)
+            inner = derivative_step(exponent, var)
+            return Step(expr, "chain rule", f"outer {base}^u, inner u = {exponent}", outer * inner.result, (inner,))
+
+        # f(x)^g(x) = e^(g·ln f)
+        sub = derivative_step(exponent * sp.log(base), var)
+        return Step(
+            expr, "logarithmic differentiation", f"write as e^({exponent}·ln({base}))",
+            expr * sub.result, (sub,)
+        )
+
+    if isinstance(expr, sp.Function) and len(expr.args) == 1:
+        u = expr.args[0]
+        t = sp.Dummy("u")
+        outer = sp.diff(expr.func(t), t).xreplace({t: u})
+        if u == var:
+            return Step(expr, "standard derivative", f"d/d{var} {expr} = {outer}", outer)
+        inner = derivative_step(u, var)
+        return Step(
+            expr, "chain rule", f"outer {expr.func}(u), inner u = {u}",
+            outer * inner.result, (inner,)
+        )
+
+    return Step(expr, "differentiate", "", sp.diff(expr, var))
+
+
+def _render_derivative(step: Step, var, lines: list, seen: set, top: bool = True):
+    # Each subexpression is written out once, however often it appears
+    if step.expr in seen:
+        return
+    seen.add(step.expr)
+
+    if top or step.rule not in ("constant", "identity"):
+        detail = f": {step.detail}" if step.detail else ""
+        lines.append(f"d/d{var} [{step.expr}] = {step.result}  ({step.rule}{detail})")
+
+    for sub in step.substeps:
+        _render_derivative(sub, var, lines, seen, top=False)
+
+
+def trace_derivative(expr, var) -> list:
+    lines = []
+    _render_derivative(derivative_step(expr, var), var, lines, set())
+    return lines
+
+
+def trace_implicit(level, var_x, var_y) -> list:
+    """
+    dy/dx for F(x, y) = 0 via the partial derivatives of F.
+    """
+    lines = [f"Write the curve as F(x, y) = 0 with F = {level}"]
+    lines.append(f"Differentiate F with respect to {var_x}, holding {var_y} fixed:")
+    lines += trace_derivative(level, var_x)
+    lines.append(f"Differentiate F with respect to {var_y}, holding {var_x} fixed:")
+    lines += trace_derivative(level, var_y)
+    lines.append("By the chain rule F_x + F_y·dy/dx = 0, so dy/dx = -F_x / F_y")
+    return lines
+
+
+# --------------------------------------------------
+# Integrals (rule trees from SymPy's manualintegrate)
+# --------------------------------------------------
+# Names for successive substitution variables (SymPy uses dummies)
+SUBSTITUTION_NAMES = ("u", "v", "w", "t", "s")
+
+
+def _describe_rule(rule, names: dict) -> str:
+    def show(expr):
+        return expr.xreplace(names)
+
+    name = type(rule).__name__
+    if name == "ConstantTimesRule":
+        return f"factor out the constant {show(rule.constant)}"
+    if name == "AddRule":
+        return "integrate term by term"
+    if name == "URule":
+        return f"substitute {show(rule.u_var)} = {show(rule.u_func)}"
+    if name == "PartsRule":
+        return f"by parts, ∫ f·g' = f·g - ∫ f'·g with f = {show(rule.u)}, g' = {show(rule.dv)}"
+    if name == "CyclicPartsRule":
+        return "integrate by parts until the original integral reappears, then solve for it"
+    if name == "RewriteRule":
+        return f"rewrite the integrand as {show(rule.rewritten)}"
+    if name == "PowerRule":
+        return "power rule: ∫ xⁿ dx = xⁿ⁺¹/(n+1)"
+    if name == "ReciprocalRule":
+        return "∫ 1/x dx = ln|x|"
+    if name == "DontKnowRule":
+        return "no elementary rule applies; left to SymPy's general algorithm"
+    # SinRule -> "standard integral (sin)", ArctanRule -> "standard integral (arctan)"
+    return f"standard integral ({name[:-len('Rule')].lower() or 'rule'})"
+
+
+def _render_integral(rule, lines: list, seen: set, names: dict):
+    name = type(rule).__name__
+    if name == "AlternativeRule":
+        _render_integral(rule.alternatives[0], lines, seen, names)
+        return
+
+    if name == "URule":
+        used = {str(symbol) for symbol in names.values()}
+        label = next((n for n in SUBSTITUTION_NAMES if n not in used), SUBSTITUTION_NAMES[0])
+        names = {**names, rule.u_var: sp.Symbol(label)}
+
+    integrand = rule.integrand
+    if integrand is not None:
+        key = (integrand, rule.variable)
+        if key in seen:
+            return
+        seen.add(key)
+        variable = rule.variable.xreplace(names)
+        result = ""
+        if name != "DontKnowRule":
+            try:
+                result = f" = {rule.eval().xreplace(names)}"
+            except Exception:
+                pass
+        lines.append(f"∫ {integrand.xreplace(names)} d{variable}{result}  ({_describe_rule(rule, names)})")
+    else:
+        lines.append(_describe_rule(rule, names))
+
+    children = []
+    for field in ("substep", "v_step", "second_step"):
+        child = getattr(rule, field, None)
+        if child is not None:
+            children.append(child)
+    children += list(getattr(rule, "substeps", None) or [])
+    children += list(getattr(rule, "parts_rules", None) or [])
+    for child in children:
+        _render_integral(child, lines, seen, names)
+
+
+@lru_cache(maxsize=512)
+def _integral_lines(integrand, var) -> tuple:
+    lines = []
+    _render_integral(integral_steps(integrand, var), lines, set(), {})
+    return tuple(lines)
+
+
+def trace_integral(integrand, var) -> list:
+    return list(_integral_lines(integrand, var))
+
+
+# --------------------------------------------------
+# Limits
+# --------------------------------------------------
+def _form(value) -> str:
+    if value == 0:
+        return "0"
+    if value.is_infinite:
+        return "∞"
+    return None
+
+
+@lru_cache(maxsize=512)
+def _limit_lines(expr, var, point, depth: int = 0) -> tuple:
+    lines = []
+    current = expr
+    approach = f"{var} → {point}"
+
+    # f^g with both varying (1^∞, 0^0, ∞^0): work with the exponent's limit
+    if current.is_Pow and current.exp.has(var) and current.base.has(var):
+        inner = current.exp * sp.log(current.base)
+        lines.append(f"Rewrite {current} = e^({inner}) and find the limit of the exponent")
+        lines += _limit_lines(inner, var, point, depth + 1)
+        value = sp.exp(sp.limit(inner, var, point))
+        lines.append(f"So the limit is e^(that limit) = {value}")
+        return tuple(lines)
+
+    for _ in range(MAX_LHOPITAL):
+        numerator, denominator = sp.fraction(sp.together(current))
+
+        if denominator == 1 and current.is_Mul:
+            # 0·∞: move one factor into a denominator to get 0/0 or ∞/∞
+            factors = current.as_ordered_factors()
+            limits = [sp.limit(f, var, point) for f in factors]
+            zero = next((f for f, v in zip(factors, limits) if v == 0), None)
+            infinite = next((f for f, v in zip(factors, limits) if v.is_infinite), None)
+            if zero is None or infinite is None:
+                break
+            # Invert the algebraic factor so a log or trig factor stays on top,
+            # as in x·ln(x) = ln(x) / (1/x)
+            moved = zero if zero.is_rational_function(var) and not infinite.is_rational_function(var) else infinite
+            numerator = sp.Mul(*[f for f in factors if f is not moved])
+            denominator = 1 / moved
+            lines.append(f"Form 0·∞ as {approach}: rewrite as ({numerator}) / ({denominator})")
+
+        top = sp.limit(numerator, var, point)
+        bottom = sp.limit(denominator, var, point)
+        top_form, bottom_form = _form(top), _form(bottom)
+        if not (top_form and top_form == bottom_form):
+            break
+
+        lines.append(
+            f"Substituting {approach} gives {top_form}/{bottom_form}: apply L'Hôpital's rule"
+        )
+        d_top = derivative_step(numerator, var).result
+        d_bottom = derivative_step(denominator, var).result
+        lines.append(f"d/d{var} [{numerator}] = {d_top}")
+        lines.append(f"d/d{var} [{denominator}] = {d_bottom}")
+        current = sp.cancel(d_top / d_bottom)
+        lines.append(f"New limit: lim {approach} of {current}")
+
+    value = sp.limit(current, var, point)
+    if lines:
+        lines.append(f"Evaluate as {approach}: {value}")
+    else:
+        lines.append(f"Substitute {approach} directly: {current} → {value}")
+    return tuple(lines)
+
+
+def trace_limit(expr, var, point) -> list:
+    return list(_limit_lines(expr, var, point))
+
+
+def clear_traces():
+    derivative_step.cache_clear()
+    _integral_lines.cache_clear()
+    _limit_lines.cache_clear()
@@ -0,0 +1,93 @@
+import numpy as np
+from sympy import Integral, diff
+
+from app import config
+from app.solver.graph import evaluate
+from app.solver.parsing import x
+
+# --------------------------------------------------
+# Numeric spot checks of symbolic answers
+#
+# Both checks evaluate compiled (lambdified, cached) callables on a fixed
+# set of sample points in one vectorized pass, so they cost a few NumPy
+# calls rather than any SymPy substitution. Each returns True (answer
+# agrees at the checked points), False (it doesn't) or None (too few
+# points where both sides are defined and finite to say either way).
+# --------------------------------------------------
+
+# Relative tolerance: |answer - reference| <= TOLERANCE * (1 + |reference|)
+TOLERANCE = 1e-5
+
+# Points near poles or overflow are skipped rather than compared
+MAX_MAGNITUDE = 1e8
+
+# Fewer usable points than this -> inconclusive
+MIN_POINTS = 8
+
+# Share of usable points that must agree (tolerates a stray point beside a pole)
+AGREEMENT = 0.9
+
+
+def sample_points(count: int = None):
+    """
+    Fixed pseudo-random points: half over [-5, 5], half over (0, 5] so
+    functions only defined for positive x (log, sqrt) are still covered.
+    Fixed so that repeated requests get the same verdict.
+    """
+    if count is None:
+        count = config.VERIFY_POINTS
+    rng = np.random.default_rng(20240601)
+    return np.concatenate([
+        rng.uniform(-5, 5, count - count // 2),
+        rng.uniform(0.05, 5, count // 2)
+    ])
+
+
+def _verdict(answer, reference):
+    usable = (
+        np.isfinite(answer) & np.isfinite(reference)
+        & (np.abs(answer) < MAX_MAGNITUDE) & (np.abs(reference) < MAX_MAGNITUDE)
+    )
+    if usable.sum() < MIN_POINTS:
+        return None
+
+    error = np.abs(answer[usable] - reference[usable])
+    agrees = error <= TOLERANCE * (1 + np.abs(reference[usable]))
+    return bool(agrees.mean() >= AGREEMENT)
+
+
+def verify_derivative(sym_expr, derivative, var=x):
+    """
+    Compares `derivative` with central finite differences of `sym_expr`.
+    """
+    if config.VERIFY_POINTS <= 0:
+        return None
+
+    xs = sample_points()
+    # Step balancing truncation (h^2) against rounding (eps / h) error
+    h = np.cbrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(xs))
+
+    # One call for f(x + h) and f(x - h) together
+    shifted = evaluate(sym_expr, var, np.concatenate([xs + h, xs - h]))
+    forward, backward = shifted[:len(xs)], shifted[len(xs):]
+    # inf - inf and overflow give non-finite points, which _verdict skips
+    with np.errstate(all="ignore"):
+        numeric = (forward - backward) / (2 * h)
+
+    return _verdict(evaluate(derivative, var, xs), numeric)
+
+
+def verify_antiderivative(integrand, antiderivative, var=x):
+    """
+    Compares d/dx of `antiderivative` with `integrand`.
+    """
+    if config.VERIFY_POINTS <= 0:
+        return None
+
+    # SymPy gave up: differentiating the unevaluated Integral just returns
+    # the integrand, which would always "agree"
+    if antiderivative.has(Integral):
+        return None
+
+    xs = sample_points()
+    return _verdict(evaluate(diff(antiderivative, var), var, xs), evaluate(integrand, var, xs))
@@ -0,0 +1,82 @@
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_timings = defaultdict(lambda: {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+_gauges = {}
+_values = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0, "buckets": defaultdict(int)})
+
+
+def increment(name: str, value: int = 1):
+    with _lock:
+        _counters[name] += value
+
+
+def observe(name: str, seconds: float):
+    """
+    Record one duration sample under `name`.
+    """
+    with _lock:
+        timing = _timings[name]
+        timing["count"] += 1
+        timing["total_seconds"] += seconds
+        timing["max_seconds"] = max(timing["max_seconds"], seconds)
+
+
+def set_gauge(name: str, value: float):
+    """
+    Record the current value of a level (memory use, queue length, ...).
+    """
+    with _lock:
+        _gauges[name] = value
+
+
+def bucket(value: float) -> str:
+    """
+    Power-of-two bucket label for `value`, e.g. 37 -> "<=64".
+    """
+    edge = 1
+    while edge < value:
+        edge *= 2
+    return f"<={edge}"
+
+
+def record(name: str, value: float):
+    """
+    Record one sample of a non-time quantity (e.g. an estimated cost);
+    the snapshot keeps a power-of-two histogram next to the totals.
+    """
+    with _lock:
+        values = _values[name]
+        values["count"] += 1
+        values["total"] += value
+        values["max"] = max(values["max"], value)
+        values["buckets"][bucket(value)] += 1
+
+
+def snapshot() -> dict:
+    """
+    Returns a JSON-safe copy of every counter and timing.
+    """
+    with _lock:
+        timings = {}
+        for name, timing in _timings.items():
+            timings[name] = dict(timing)
+            timings[name]["avg_seconds"] = timing["total_seconds"] / timing["count"]
+
+        values = {}
+        for name, value in _values.items():
+            values[name] = {
+                "count": value["count"],
+                "avg": value["total"] / value["count"],
+                "max": value["max"],
+                "buckets": dict(sorted(value["buckets"].items(), key=lambda item: int(item[0][2:])))
+            }
+
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(sorted(_gauges.items())),
+            "timings": timings,
+            "values": values
+        }
@@ -0,0 +1,40 @@
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    """
+    Encodes `content` as compact JSON.
+    Uses orjson when installed (NumPy arrays are encoded natively),
+    otherwise falls back to the stdlib encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse that skips FastAPI's encoder and renders with `dumps`.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
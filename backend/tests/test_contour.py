@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from app import config
+from app.solver.contour import _stitch, implicit_graph_data, rows_per_chunk
+from app.solver.parsing import x, y
+
+
+def polylines(curve):
+    """
+    Splits None-separated curve lists into arrays of (x, y) points.
+    """
+    lines, current = [], []
+    for px, py in zip(curve["x"], curve["y"]):
+        if px is None:
+            lines.append(np.array(current))
+            current = []
+        else:
+            current.append((px, py))
+    lines.append(np.array(current))
+    return lines
+
+
+@pytest.fixture
+def tiny_chunks(monkeypatch):
+    # Two grid rows per chunk, so every cell boundary is also a chunk boundary
+    monkeypatch.setattr(config, "IMPLICIT_GRID_BUDGET_BYTES", 1)
+
+
+def test_rows_per_chunk():
+    assert rows_per_chunk(100, budget_bytes=1) == 2
+    assert rows_per_chunk(100, budget_bytes=100 * 8 * 16 * 10) == 10
+
+
+def test_stitch_joins_paths_and_closes_loops():
+    points = {e: (float(e), 0.0) for e in range(10)}
+    # An open path 1-2-3 given out of order, and a loop 5-6-7-5
+    segments = [(2, 3), (1, 2), (6, 7), (5, 6), (7, 5)]
+
+    out_x, out_y = _stitch(segments, points)
+
+    path, loop = polylines({"x": out_x, "y": out_y})
+    assert list(path[:, 0]) in ([1, 2, 3], [3, 2, 1])
+    assert len(loop) == 4 and loop[0, 0] == loop[-1, 0]
+    assert set(loop[:, 0]) == {5, 6, 7}
+
+
+def test_circle_is_one_closed_loop(tiny_chunks):
+    graph = implicit_graph_data(x ** 2 + y ** 2 - 4, -x / y, start=-3, end=3, num=61)
+
+    (loop,) = polylines(graph["curve"])
+    assert np.allclose(loop[0], loop[-1])
+    assert np.allclose(np.hypot(loop[:, 0], loop[:, 1]), 2, atol=0.02)
+
+
+def test_chunking_does_not_change_the_curve(monkeypatch):
+    level = x ** 2 / 9 + y ** 2 - 1
+
+    monkeypatch.setattr(config, "IMPLICIT_GRID_BUDGET_BYTES", 1)
+    chunked = implicit_graph_data(level, x, num=80)
+    monkeypatch.setattr(config, "IMPLICIT_GRID_BUDGET_BYTES", 1 << 30)
+    whole = implicit_graph_data(level, x, num=80)
+
+    # Same points and components; a loop may start (and close) elsewhere
+    assert set(zip(chunked["curve"]["x"], chunked["curve"]["y"])) == \
+        set(zip(whole["curve"]["x"], whole["curve"]["y"]))
+    assert len(polylines(chunked["curve"])) == len(polylines(whole["curve"])) == 1
+
+
+def test_separate_components(tiny_chunks):
+    level = ((x - 2) ** 2 + y ** 2 - 1) * ((x + 2) ** 2 + y ** 2 - 1)
+
+    lines = polylines(implicit_graph_data(level, x, start=-4, end=4, num=81)["curve"])
+
+    assert len(lines) == 2
+    centres = sorted(round(float(line[:, 0].mean())) for line in lines)
+    assert centres == [-2, 2]
+
+
+def test_open_curve_runs_edge_to_edge(tiny_chunks):
+    (line,) = polylines(implicit_graph_data(y - x, -1 + 0 * x, start=-5, end=5, num=40)["curve"])
+
+    assert np.allclose(line[:, 0], line[:, 1], atol=1e-6)
+    ends = sorted([line[0, 0], line[-1, 0]])
+    assert ends[0] == pytest.approx(-5, abs=0.3) and ends[1] == pytest.approx(5, abs=0.3)
+
+
+def test_slope_field_has_a_fixed_grid():
+    for num in (21, 300):
+        graph = implicit_graph_data(x ** 2 + y ** 2 - 4, -x / y, num=num)
+        assert len(graph["grid"]["x"]) == len(graph["grid"]["y"]) == config.IMPLICIT_SLOPE_POINTS
+        assert len(graph["dydx"]) == config.IMPLICIT_SLOPE_POINTS
+        assert all(len(row) == config.IMPLICIT_SLOPE_POINTS for row in graph["dydx"])
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from app.solver import graph
+from app.solver.graph import GraphWindowCache, downsample
+from app.solver.parsing import x
+
+
+# --------------------------------------------------
+# LTTB downsampling
+# --------------------------------------------------
+def test_downsample_keeps_target_count_and_endpoints():
+    xs = np.linspace(-10, 10, 1000)
+    ys = np.sin(xs)
+
+    out_x, out_y = downsample(xs, ys, 100)
+
+    assert len(out_x) == len(out_y) == 100
+    assert out_x[0] == xs[0] and out_x[-1] == xs[-1]
+    assert np.all(np.diff(out_x) > 0)
+    # Every kept point is an original sample, not an interpolation
+    assert np.allclose(out_y, np.sin(out_x))
+
+
+def test_downsample_returns_small_inputs_unchanged():
+    xs = np.arange(5.0)
+    out_x, out_y = downsample(xs, xs ** 2, 10)
+    assert out_x is xs
+    assert list(out_y) == [0, 1, 4, 9, 16]
+
+
+@pytest.mark.parametrize("target, expected", [(0, []), (1, [0.0]), (2, [0.0, 9.0])])
+def test_downsample_tiny_targets_keep_the_ends(target, expected):
+    xs = np.arange(10.0)
+    out_x, _ = downsample(xs, xs, target)
+    assert list(out_x) == expected
+
+
+def test_downsample_keeps_isolated_peaks():
+    xs = np.linspace(0, 1, 1001)
+    ys = np.zeros_like(xs)
+    ys[337] = 50.0
+    ys[712] = -50.0
+
+    out_x, out_y = downsample(xs, ys, 20)
+
+    assert 50.0 in out_y and -50.0 in out_y
+
+
+def test_downsample_keeps_gaps():
+    xs = np.linspace(-5, 5, 1000)
+    ys = np.where(np.abs(xs) < 1, np.nan, xs)
+
+    _, out_y = downsample(xs, ys, 50)
+
+    assert np.isnan(out_y).any()
+    assert np.isfinite(out_y[0]) and np.isfinite(out_y[-1])
+
+
+# --------------------------------------------------
+# Pan/zoom window cache
+# --------------------------------------------------
+@pytest.fixture
+def evaluated(monkeypatch):
+    """
+    Records how many points each `evaluate` call in app.solver.graph samples.
+    """
+    calls = []
+    original = graph.evaluate
+
+    def spy(sym_expr, var, xs):
+        calls.append(len(xs))
+        return original(sym_expr, var, xs)
+
+    monkeypatch.setattr(graph, "evaluate", spy)
+    return calls
+
+
+@pytest.mark.parametrize("start, end, num", [
+    (-2, 1.5, 3),
+    (-2, 1.5, 4),
+    (0, 1, 4),
+    (-3.3, 7.1, 50),
+    (-10, 10, 400),
+    (123.456, 123.789, 17),
+])
+def test_window_columns_span_exactly_the_window(start, end, num):
+    cache = GraphWindowCache(x ** 2)
+
+    sampled = cache.sample(start, end, num)
+    xs, ys = np.array(sampled["x"]), np.array(sampled["y"])
+
+    assert len(xs) == num
+    assert xs[0] == round(start, 4) and xs[-1] == round(end, 4)
+    assert np.all(np.diff(xs) > 0)
+    assert np.allclose(ys, xs ** 2, atol=1e-3)
+
+
+def test_window_two_points_samples_the_edges():
+    sampled = GraphWindowCache(x + 1).sample(-1, 3, 2)
+    assert sampled == {"x": [-1.0, 3.0], "y": [0.0, 4.0]}
+
+
+def test_panning_only_evaluates_new_columns(evaluated):
+    cache = GraphWindowCache(x ** 3)
+    cache.sample(0, 10, 12)
+    evaluated.clear()
+
+    # One step to the right: one new grid column plus the window edges
+    cache.sample(1, 11, 12)
+
+    assert sum(evaluated) <= 1 + 3
+
+
+def test_zooming_back_reuses_the_grid(evaluated):
+    cache = GraphWindowCache(x ** 3)
+    cache.sample(-10, 10, 102)
+    cache.sample(-1, 1, 102)
+    evaluated.clear()
+
+    cache.sample(-10, 10, 102)
+
+    # Only the edges are evaluated again
+    assert sum(evaluated) <= 3
+
+
+def test_window_cache_is_bounded():
+    cache = GraphWindowCache(x, max_points=250)
+    for k in range(20):
+        cache.sample(k * 7.0, k * 7.0 + 5.0 + k, 100)
+
+    assert sum(len(g) for g in cache._grids.values()) <= 250
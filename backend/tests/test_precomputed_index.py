@@ -0,0 +1,90 @@
+import pytest
+
+from app import config
+from app.precomputed import index as index_module
+from app.precomputed.index import PrecomputedIndex, write_index
+
+
+def build(tmp_path, entries):
+    path = str(tmp_path / "answers.idx")
+    write_index(path, entries)
+    return PrecomputedIndex(path)
+
+
+def entries_for(count):
+    return {f"d/dx(x^{n})": f'{{"solution": "{n}*x**{n - 1}"}}'.encode("utf-8") for n in range(2, count + 2)}
+
+
+def test_round_trip(tmp_path):
+    entries = entries_for(200)
+    index = build(tmp_path, entries)
+
+    assert index.entries == len(entries)
+    for expression, payload in entries.items():
+        assert index.lookup(expression) == (expression, payload)
+
+
+def test_lookup_ignores_whitespace_only(tmp_path):
+    index = build(tmp_path, {"d/dx(sin(x))": b"{}"})
+
+    assert index.lookup("  d/dx ( sin(x) ) ") == ("d/dx(sin(x))", b"{}")
+    # Symbols are case-sensitive, so case is part of the key
+    assert index.lookup("d/dx(SIN(x))") is None
+
+
+def test_missing_expressions_are_not_found(tmp_path):
+    index = build(tmp_path, entries_for(50))
+
+    assert index.lookup("d/dx(x^1000)") is None
+    assert index.lookup("") is None
+
+
+def test_empty_index(tmp_path):
+    index = build(tmp_path, {})
+
+    assert index.entries == 0
+    assert index.lookup("x + 1 = 2") is None
+
+
+@pytest.mark.parametrize("forced_hash", [1, 2 ** 64 - 1])
+def test_colliding_hashes_are_probed(tmp_path, monkeypatch, forced_hash):
+    # Every key lands on the same slot (the last one for 2^64 - 1, so
+    # probing has to wrap around to the start of the table)
+    monkeypatch.setattr(index_module, "key_hash", lambda expression: forced_hash)
+    entries = entries_for(10)
+    index = build(tmp_path, entries)
+
+    for expression, payload in entries.items():
+        assert index.lookup(expression) == (expression, payload)
+    assert index.lookup("d/dx(x^99)") is None
+
+
+def test_duplicate_keys_keep_the_last_entry(tmp_path):
+    index = build(tmp_path, {"x + 1 = 2": b"old", "x+1=2": b"new"})
+
+    assert index.lookup("x + 1 = 2") == ("x+1=2", b"new")
+
+
+def test_settings_change_disables_the_index(tmp_path, monkeypatch):
+    path = str(tmp_path / "answers.idx")
+    write_index(path, entries_for(5))
+
+    monkeypatch.setattr(config, "VERIFY_POINTS", config.VERIFY_POINTS + 1)
+    index = PrecomputedIndex(path)
+
+    assert index.entries == 0
+    assert index.lookup("d/dx(x^2)") is None
+
+
+@pytest.mark.parametrize("contents", [b"", b"not an index", b"AMSIDX\x00\x00" + b"\x00" * 3])
+def test_foreign_files_are_ignored(tmp_path, contents):
+    path = tmp_path / "answers.idx"
+    path.write_bytes(contents)
+
+    index = PrecomputedIndex(str(path))
+
+    assert index.lookup("d/dx(x^2)") is None
+
+
+def test_missing_file(tmp_path):
+    assert PrecomputedIndex(str(tmp_path / "missing.idx")).lookup("d/dx(x^2)") is None